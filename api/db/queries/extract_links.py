@@ -1,7 +1,9 @@
 """Database queries for extract_links table."""
-from typing import Any
+from typing import Any, Iterable
 from uuid import UUID
 
+from postgrest import CountMethod, ReturnMethod
+
 from db import get_supabase_client
 
 
@@ -91,6 +93,54 @@ class ExtractLinkQueries:
         )
         return result.data
 
+    def bulk_insert(
+        self,
+        links: Iterable[tuple[str | UUID, str | UUID, dict[str, Any]]],
+        job_id: str | UUID | None = None,
+    ) -> int:
+        """
+        Bulk insert link rows in one request without returning them.
+
+        Same upsert as create_many, but the inserted rows are not sent back;
+        only their count is. Use this when the caller needs no link records.
+        Takes plain (from_id, to_id, content) tuples, so the request row is
+        the only dict built per link; any iterable (e.g. a generator) works.
+
+        Args:
+            links: (from_id, to_id, content) tuples
+            job_id: Optional job_id to attach to all links
+
+        Returns:
+            Number of links inserted (excludes duplicates that were skipped)
+        """
+        if job_id:
+            job_id_str = str(job_id)
+            normalized = [
+                {"from_id": str(from_id), "to_id": str(to_id), "content": content, "job_id": job_id_str}
+                for from_id, to_id, content in links
+            ]
+        else:
+            normalized = [
+                {"from_id": str(from_id), "to_id": str(to_id), "content": content}
+                for from_id, to_id, content in links
+            ]
+
+        if not normalized:
+            return 0
+
+        result = (
+            self.db.table("extract_links")
+            .upsert(
+                normalized,
+                on_conflict="from_id,to_id",
+                ignore_duplicates=True,
+                count=CountMethod.exact,
+                returning=ReturnMethod.minimal,
+            )
+            .execute()
+        )
+        return result.count or 0
+
     def get_by_from_id(self, from_id: str | UUID) -> list[dict]:
         """Get all links originating from an extract."""
         result = (
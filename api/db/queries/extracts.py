@@ -256,6 +256,125 @@ class ExtractQueries:
 
         return filtered
 
+    def get_library_extracts_version(
+        self,
+        library_id: str | UUID,
+        extract_type: str,
+    ) -> str | None:
+        """
+        Get a cheap change marker for a library's extracts of a given type.
+
+        The marker changes whenever a paper is added to or removed from the
+        library, a new extract of this type is created for one of its papers,
+        or one of those extracts gets an embedding.
+        Used to invalidate in-process caches without refetching the extracts.
+
+        Args:
+            library_id: UUID of the library
+            extract_type: Type of extract ('claim', 'method', 'observation')
+
+        Returns:
+            Version string, or None if the library has no papers
+        """
+        library_papers = (
+            self.db.table("library_papers")
+            .select("paper_id, added_at")
+            .eq("library_id", str(library_id))
+            .execute()
+        )
+
+        if not library_papers.data:
+            return None
+
+        paper_ids = [row["paper_id"] for row in library_papers.data]
+        latest_added = max((row["added_at"] or "") for row in library_papers.data)
+
+        latest = (
+            self.db.table("extracts")
+            .select("created_at")
+            .in_("paper_id", paper_ids)
+            .eq("type", extract_type)
+            .order("created_at", desc=True)
+            .limit(1)
+            .execute()
+        )
+        latest_created = latest.data[0]["created_at"] if latest.data else ""
+
+        # Vectors are written after their extracts, so an extract's embedding
+        # can appear without any new extract row
+        latest_vector = (
+            self.db.table("extract_vectors")
+            .select("created_at, extracts!inner(paper_id, type)")
+            .in_("extracts.paper_id", paper_ids)
+            .eq("extracts.type", extract_type)
+            .order("created_at", desc=True)
+            .limit(1)
+            .execute()
+        )
+        latest_embedded = latest_vector.data[0]["created_at"] if latest_vector.data else ""
+
+        return f"{len(paper_ids)}:{latest_added}:{latest_created}:{latest_embedded}"
+
+    def get_extracts_with_embeddings_by_library(
+        self,
+        library_id: str | UUID,
+        extract_type: str,
+    ) -> list[dict]:
+        """
+        Get extracts of a given type for a library with their embeddings (latest job only per paper).
+
+        The embedding is joined in the same request (PostgREST embed over the
+        extract_vectors.extract_id foreign key), so no second lookup by
+        extract id is needed.
+
+        Args:
+            library_id: UUID of the library
+            extract_type: Type of extract ('claim', 'method', 'observation')
+
+        Returns:
+            List of extract records, each with an 'embedding' key
+            (None if the extract has no vector)
+        """
+        library_papers = (
+            self.db.table("library_papers")
+            .select("paper_id")
+            .eq("library_id", str(library_id))
+            .execute()
+        )
+
+        paper_ids = [row["paper_id"] for row in library_papers.data]
+
+        if not paper_ids:
+            return []
+
+        result = (
+            self.db.table("extracts")
+            .select("*, extract_vectors(embedding)")
+            .in_("paper_id", paper_ids)
+            .eq("type", extract_type)
+            .order("created_at", desc=True)
+            .execute()
+        )
+
+        # First extract seen per paper is the latest (ordered by created_at desc)
+        latest_job_per_paper: dict[str, str | None] = {}
+        for extract in result.data:
+            latest_job_per_paper.setdefault(extract["paper_id"], extract["job_id"])
+
+        extracts = []
+        for extract in result.data:
+            if extract["job_id"] != latest_job_per_paper[extract["paper_id"]]:
+                continue
+
+            # unique(extract_id) makes this a one-to-one embed (an object), but accept a list too
+            vector = extract.pop("extract_vectors", None)
+            if isinstance(vector, list):
+                vector = vector[0] if vector else None
+            extract["embedding"] = vector["embedding"] if vector else None
+            extracts.append(extract)
+
+        return extracts
+
     def _get_extracts_by_library(
         self,
         library_id: str | UUID,
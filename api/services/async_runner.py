@@ -0,0 +1,64 @@
+"""Long-lived event loop for running async pipelines (linking, embedding) from sync code."""
+import asyncio
+import atexit
+import os
+import threading
+from collections.abc import Coroutine
+from typing import Any, TypeVar
+
+try:
+    import uvloop
+except ImportError:  # Comes with uvicorn[standard]; not available on Windows
+    uvloop = None
+
+T = TypeVar("T")
+
+# Faster scheduling and socket I/O for the many concurrent API requests, when available
+_LOOP_FACTORY = uvloop.new_event_loop if uvloop is not None else None
+
+# One runner per process, owned by the main thread (worker processes each get their own after fork)
+_runner: asyncio.Runner | None = None
+_runner_pid: int | None = None
+
+
+def _close_runner() -> None:
+    """Close the process runner at interpreter exit."""
+    if _runner is not None and _runner_pid == os.getpid():
+        _runner.close()
+
+
+atexit.register(_close_runner)
+
+
+def run_async(coro: Coroutine[Any, Any, T]) -> T:
+    """
+    Run a coroutine to completion on this process's long-lived event loop.
+
+    Drop-in replacement for asyncio.run in sync entry points such as the
+    linkers and the batch embedder.
+    The loop is created on first use and reused for every later job in the
+    process, so loop setup is paid once and connection pools bound to the
+    loop (e.g. the LLM client's async HTTP pool) survive across jobs.
+
+    Like asyncio.run, must not be called from a running event loop. Calls
+    from other threads fall back to a one-off loop, since a Runner's loop can
+    only be driven by one thread at a time. Loops are uvloop when installed.
+
+    Args:
+        coro: Coroutine to run
+
+    Returns:
+        The coroutine's result
+    """
+    global _runner, _runner_pid
+
+    if threading.current_thread() is not threading.main_thread():
+        with asyncio.Runner(loop_factory=_LOOP_FACTORY) as runner:
+            return runner.run(coro)
+
+    # A runner inherited through fork belongs to the parent's loop
+    if _runner is None or _runner_pid != os.getpid():
+        _runner = asyncio.Runner(loop_factory=_LOOP_FACTORY)
+        _runner_pid = os.getpid()
+
+    return _runner.run(coro)
@@ -32,6 +32,27 @@ class JobQueue:
         job_data = JobCreate(job_type=job_type, payload=payload, max_attempts=max_attempts)
         return self.create_job(job_data)
 
+    def create_jobs_by_type(
+        self,
+        job_type: JobType,
+        payloads: list[dict[str, Any]],
+        max_attempts: int = 3
+    ) -> list[Job]:
+        """Create several jobs of one type with a single insert."""
+        if not payloads:
+            return []
+
+        result = self.db.table("jobs").insert([
+            {
+                "job_type": job_type.value,
+                "payload": payload,
+                "max_attempts": max_attempts,
+            }
+            for payload in payloads
+        ]).execute()
+
+        return [Job(**row) for row in result.data]
+
     def get_job(self, job_id: UUID) -> Job | None:
         """Get a job by ID."""
         result = self.db.table("jobs").select("*").eq("id", str(job_id)).execute()
@@ -100,39 +121,68 @@ class JobQueue:
         Returns:
             True if there are pending/running processing jobs, False otherwise
         """
-        # Get all paper_ids in this library
+        library_ids = self.get_libraries_with_pending_processing_jobs(
+            [library_id], exclude_job_id=exclude_job_id
+        )
+        return bool(library_ids)
+
+    def get_libraries_with_pending_processing_jobs(
+        self,
+        library_ids: list[str | UUID],
+        exclude_job_id: str | UUID | None = None,
+    ) -> set[str]:
+        """
+        Find which of the given libraries have papers with pending/running processing jobs.
+
+        Batched version of has_pending_processing_jobs_for_library: two queries
+        in total (library papers, then active jobs for all of those papers)
+        instead of one jobs query per paper per library.
+
+        Args:
+            library_ids: UUIDs of the libraries to check
+            exclude_job_id: Optional job to ignore (e.g. the job triggering the check)
+
+        Returns:
+            Set of library IDs (as strings) with pending/running processing jobs
+        """
+        if not library_ids:
+            return set()
+
+        # Get all paper_ids in these libraries
         library_papers = (
             self.db.table("library_papers")
-            .select("paper_id")
-            .eq("library_id", str(library_id))
+            .select("library_id, paper_id")
+            .in_("library_id", [str(library_id) for library_id in library_ids])
             .execute()
         )
 
         if not library_papers.data:
-            return False
+            return set()
 
-        paper_ids = [lp["paper_id"] for lp in library_papers.data]
+        libraries_by_paper: dict[str, set[str]] = {}
+        for lp in library_papers.data:
+            libraries_by_paper.setdefault(lp["paper_id"], set()).add(lp["library_id"])
 
         # Check for pending/running PARSE_PAPER or EXTRACT_ELEMENTS jobs
         # Jobs store paper_id in payload->>'paper_id'
         processing_types = [JobType.PARSE_PAPER.value, JobType.EXTRACT_ELEMENTS.value]
         active_statuses = [JobStatus.PENDING.value, JobStatus.RUNNING.value]
 
-        for paper_id in paper_ids:
-            query = (
-                self.db.table("jobs")
-                .select("id")
-                .in_("job_type", processing_types)
-                .in_("status", active_statuses)
-                .eq("payload->>paper_id", paper_id)
-            )
-            if exclude_job_id:
-                query = query.neq("id", str(exclude_job_id))
-            result = query.limit(1).execute()
-            if result.data:
-                return True
-
-        return False
+        query = (
+            self.db.table("jobs")
+            .select("paper_id:payload->>paper_id")
+            .in_("job_type", processing_types)
+            .in_("status", active_statuses)
+            .in_("payload->>paper_id", list(libraries_by_paper))
+        )
+        if exclude_job_id:
+            query = query.neq("id", str(exclude_job_id))
+        result = query.execute()
+
+        busy_libraries: set[str] = set()
+        for job in result.data:
+            busy_libraries.update(libraries_by_paper.get(job["paper_id"], ()))
+        return busy_libraries
 
     def has_recent_pending_link_job(
         self,
@@ -153,20 +203,41 @@ class JobQueue:
         Returns:
             True if there's a recent pending link job, False otherwise
         """
+        return bool(self.get_libraries_with_recent_pending_link_job([library_id], minutes=minutes))
+
+    def get_libraries_with_recent_pending_link_job(
+        self,
+        library_ids: list[str | UUID],
+        minutes: int = 3,
+    ) -> set[str]:
+        """
+        Find which of the given libraries have a recent pending LINK_LIBRARY job.
+
+        Batched version of has_recent_pending_link_job (one query for all libraries).
+
+        Args:
+            library_ids: UUIDs of the libraries to check
+            minutes: How far back to look for existing jobs (default 3 minutes)
+
+        Returns:
+            Set of library IDs (as strings) with a recent pending link job
+        """
+        if not library_ids:
+            return set()
+
         cutoff = datetime.now(timezone.utc) - timedelta(minutes=minutes)
 
         result = (
             self.db.table("jobs")
-            .select("id")
+            .select("library_id:payload->>library_id")
             .eq("job_type", JobType.LINK_LIBRARY.value)
             .eq("status", JobStatus.PENDING.value)
-            .eq("payload->>library_id", str(library_id))
+            .in_("payload->>library_id", [str(library_id) for library_id in library_ids])
             .gte("created_at", cutoff.isoformat())
-            .limit(1)
             .execute()
         )
 
-        return len(result.data) > 0
+        return {job["library_id"] for job in result.data}
 
     def get_previous_link_job_claimed_at(
         self,
@@ -1,14 +1,17 @@
 """Link claims to other claims within a library using DSPy."""
 import asyncio
+import json
 import logging
 from typing import Any, Callable
 from uuid import UUID
 
 import dspy
 import numpy as np
+import orjson
 from pydantic import BaseModel, Field
 
 from db import ExtractQueries, PaperQueries, VectorQueries
+from services.async_runner import run_async
 
 logger = logging.getLogger(__name__)
 
@@ -128,6 +131,11 @@ class ClaimLinker(dspy.Module):
         result = self.link(claims_json=claims_json)
         return result.links
 
+    async def aforward(self, claims_json: str) -> list[ClaimLink]:
+        """Find links between claims without blocking the event loop."""
+        result = await self.link.acall(claims_json=claims_json)
+        return result.links
+
 
 # --- Similarity & Grouping ---
 
@@ -267,14 +275,12 @@ def add_embeddings_to_claims(claims: list[dict]) -> list[dict]:
     vector_records = vectors.get_by_extract_ids(claim_ids)
 
     # Build lookup (parse string embeddings if needed)
-    import json
-
     embedding_by_id = {}
     for v in vector_records:
         emb = v["embedding"]
         # Handle string-encoded embeddings from DB
         if isinstance(emb, str):
-            emb = json.loads(emb)
+            emb = orjson.loads(emb)
         embedding_by_id[v["extract_id"]] = emb
 
     # Merge embeddings into claims
@@ -292,22 +298,28 @@ def add_embeddings_to_claims(claims: list[dict]) -> list[dict]:
 
 def _fetch_claims_with_embeddings(library_id: str) -> list[dict]:
     """
-    Fetch all claims for a library and merge in their embeddings.
+    Fetch all claims for a library with their embeddings (joined in one query).
 
     Args:
         library_id: UUID of the library
 
     Returns:
-        List of claim dicts, each with an 'embedding' key added
+        List of claim dicts, each with an 'embedding' key (claims without embeddings are skipped)
     """
-    extracts = ExtractQueries()
+    claims = ExtractQueries().get_extracts_with_embeddings_by_library(library_id, "claim")
 
-    # Fetch claims
-    claims = extracts.get_claims_by_library(library_id)
-    if not claims:
-        return []
+    claims_with_embeddings = []
+    for claim in claims:
+        emb = claim["embedding"]
+        if emb is None:
+            logger.warning(f"Claim {claim['id']} has no embedding, skipping")
+            continue
+        # Handle string-encoded embeddings from DB
+        if isinstance(emb, str):
+            claim["embedding"] = orjson.loads(emb)
+        claims_with_embeddings.append(claim)
 
-    return add_embeddings_to_claims(claims)
+    return claims_with_embeddings
 
 
 # --- Helper Functions ---
@@ -342,8 +354,6 @@ def add_paper_titles_to_claims(claims: list[dict]) -> list[dict]:
 
 def _format_claims_for_llm(claims: list[dict]) -> str:
     """Format claims as JSON for the DSPy module."""
-    import json
-
     formatted = []
     for claim in claims:
         formatted.append({
@@ -403,9 +413,8 @@ async def _process_group(
         claims_json = _format_claims_for_llm(group.claims)
 
         try:
-            # Run DSPy in thread pool since it's synchronous
-            loop = asyncio.get_event_loop()
-            links = await loop.run_in_executor(None, linker, claims_json)
+            # Native async DSPy call - no thread pool handoff
+            links = await linker.acall(claims_json)
             logger.info(f"Found {len(links)} links in group {group_idx + 1}")
             return links
         except Exception as e:
@@ -413,10 +422,9 @@ async def _process_group(
             return []
 
 
-def _aggregate_usage_from_history() -> UsageStats:
-    """Aggregate usage stats from all LM history entries."""
+def _aggregate_usage_from_history(lm: dspy.LM | None) -> UsageStats:
+    """Aggregate usage stats from all history entries of the given LM."""
     stats = UsageStats()
-    lm = dspy.settings.lm
     if lm and lm.history:
         for entry in lm.history:
             usage = entry.get("usage", {})
@@ -454,50 +462,53 @@ async def _link_claims_async(
     semaphore = asyncio.Semaphore(max_concurrent)
     linker = ClaimLinker()
 
-    # Clear history before run so we only capture this batch
+    # Run on a private copy of the configured LM: its history holds exactly
+    # this run's calls, so a concurrent run (e.g. c2o in the link job) never
+    # clears or reads these entries in the shared global LM
     lm = dspy.settings.lm
-    if lm:
-        lm.history.clear()
+    run_lm = lm.copy() if lm else None
 
     all_links: list[ClaimLink] = []
     total_saved = 0
 
-    # Process groups in batches
-    for batch_start in range(0, len(groups), batch_size):
-        batch_end = min(batch_start + batch_size, len(groups))
-        batch_groups = groups[batch_start:batch_end]
+    with dspy.context(lm=run_lm):
+        # Process groups in batches
+        for batch_start in range(0, len(groups), batch_size):
+            batch_end = min(batch_start + batch_size, len(groups))
+            batch_groups = groups[batch_start:batch_end]
 
-        logger.info(f"Processing c2c batch {batch_start // batch_size + 1} (groups {batch_start + 1}-{batch_end})")
+            logger.info(f"Processing c2c batch {batch_start // batch_size + 1} (groups {batch_start + 1}-{batch_end})")
 
-        tasks = [
-            _process_group(semaphore, linker, group, batch_start + i)
-            for i, group in enumerate(batch_groups)
-        ]
+            tasks = [
+                _process_group(semaphore, linker, group, batch_start + i)
+                for i, group in enumerate(batch_groups)
+            ]
 
-        results = await asyncio.gather(*tasks)
+            results = await asyncio.gather(*tasks)
 
-        # Flatten batch results
-        batch_links: list[ClaimLink] = []
-        for links in results:
-            batch_links.extend(links)
+            # Flatten batch results
+            batch_links: list[ClaimLink] = []
+            for links in results:
+                batch_links.extend(links)
 
-        # Deduplicate within batch
-        batch_unique = _deduplicate_links(batch_links)
-        all_links.extend(batch_unique)
+            # Deduplicate within batch
+            batch_unique = _deduplicate_links(batch_links)
+            all_links.extend(batch_unique)
 
-        # Save batch to database (upsert handles cross-batch duplicates)
-        if batch_unique and job_id is not None:
-            saved = save_c2c_links(batch_unique, job_id, valid_claim_ids)
-            total_saved += saved
-            logger.info(f"Saved {saved} c2c links from batch {batch_start // batch_size + 1}")
+            # Save batch to database (upsert handles cross-batch duplicates), off the
+            # event loop so a concurrent linker's LLM calls keep going meanwhile
+            if batch_unique and job_id is not None:
+                saved = await asyncio.to_thread(save_c2c_links, batch_unique, job_id, valid_claim_ids)
+                total_saved += saved
+                logger.info(f"Saved {saved} c2c links from batch {batch_start // batch_size + 1}")
 
-        # Report progress - extract pivot claim ID from each group (first claim is pivot)
-        if progress_callback:
-            batch_pivot_ids = [g.claims[0]["id"] for g in batch_groups]
-            progress_callback(batch_pivot_ids)
+            # Report progress - extract pivot claim ID from each group (first claim is pivot)
+            if progress_callback:
+                batch_pivot_ids = [g.claims[0]["id"] for g in batch_groups]
+                progress_callback(batch_pivot_ids)
 
-    # Aggregate usage from all history entries after completion
-    stats = _aggregate_usage_from_history()
+    # Aggregate usage from this run's calls only
+    stats = _aggregate_usage_from_history(run_lm)
 
     return all_links, stats, total_saved
 
@@ -511,16 +522,21 @@ class C2CLinkingResult:
     links_saved: int = 0
 
 
-def link_claims(
+async def link_claims_async(
     input_claims: list[dict],
     library_id: str | UUID,
     similarity_threshold: float = 0.35,
     job_id: str | None = None,
     valid_claim_ids: set[str] | None = None,
     progress_callback: Callable[[list[str]], None] | None = None,
+    library_claims: list[dict] | None = None,
 ) -> C2CLinkingResult:
     """
-    Find links between input claims and all claims in a library.
+    Find links between input claims and all claims in a library (async).
+
+    Coroutine version of link_claims, for callers that already drive an event
+    loop. Its blocking DB work runs in worker threads, so it can share a loop
+    with other linkers.
 
     Computes asymmetric similarity (input_claims x library_claims) so edges
     can only involve input claims. For full library mode, pass all claims as input.
@@ -541,6 +557,10 @@ def link_claims(
         similarity_threshold: Minimum cosine similarity to consider claims related
         job_id: Optional job ID for associating saved links (enables per-batch saving)
         valid_claim_ids: Optional set of valid claim IDs for validation
+            (defaults to the IDs of the input and library claims)
+        progress_callback: Optional callback(processed_claim_ids) called after each batch
+        library_claims: Optional library claims with embeddings, if the caller
+            already fetched them (skips the fetch in step 1)
 
     Returns:
         C2CLinkingResult with discovered links, usage stats, and save count
@@ -563,12 +583,14 @@ def link_claims(
         )
 
     # 1. Fetch all claims from library (these are the comparison targets)
-    library_claims = _fetch_claims_with_embeddings(library_id_str)
-    logger.info(f"Fetched {len(library_claims)} total claims from library")
+    if library_claims is None:
+        library_claims = await asyncio.to_thread(_fetch_claims_with_embeddings, library_id_str)
+        logger.info(f"Fetched {len(library_claims)} total claims from library")
 
     # Add paper titles to all claims for LLM context
-    add_paper_titles_to_claims(input_claims)
-    add_paper_titles_to_claims(library_claims)
+    await asyncio.to_thread(add_paper_titles_to_claims, input_claims)
+    if library_claims is not input_claims:
+        await asyncio.to_thread(add_paper_titles_to_claims, library_claims)
 
     if len(library_claims) < 2:
         logger.info("Not enough claims in library to link")
@@ -609,14 +631,17 @@ def link_claims(
             links_saved=0,
         )
 
+    # Build valid_claim_ids if not provided - the LLM only sees input and library claims
+    if valid_claim_ids is None:
+        valid_claim_ids = {c["id"] for c in library_claims}
+        valid_claim_ids.update(c["id"] for c in input_claims)
+
     # 4. Run linker on all groups concurrently (saves per-batch if job_id provided)
-    all_links, stats, total_saved = asyncio.run(
-        _link_claims_async(
-            groups,
-            job_id=job_id,
-            valid_claim_ids=valid_claim_ids,
-            progress_callback=progress_callback,
-        )
+    all_links, stats, total_saved = await _link_claims_async(
+        groups,
+        job_id=job_id,
+        valid_claim_ids=valid_claim_ids,
+        progress_callback=progress_callback,
     )
 
     # 5. Deduplicate links (for return value - DB already handles duplicates)
@@ -638,10 +663,38 @@ def link_claims(
     )
 
 
+def link_claims(
+    input_claims: list[dict],
+    library_id: str | UUID,
+    similarity_threshold: float = 0.35,
+    job_id: str | None = None,
+    valid_claim_ids: set[str] | None = None,
+    progress_callback: Callable[[list[str]], None] | None = None,
+    library_claims: list[dict] | None = None,
+) -> C2CLinkingResult:
+    """
+    Find links between input claims and all claims in a library.
+
+    Synchronous wrapper around link_claims_async; see it for the steps and arguments.
+    """
+    return run_async(
+        link_claims_async(
+            input_claims,
+            library_id,
+            similarity_threshold=similarity_threshold,
+            job_id=job_id,
+            valid_claim_ids=valid_claim_ids,
+            progress_callback=progress_callback,
+            library_claims=library_claims,
+        )
+    )
+
+
 def link_claims_in_library(
     library_id: str | UUID,
     similarity_threshold: float = 0.35,
     job_id: str | None = None,
+    claims: list[dict] | None = None,
 ) -> C2CLinkingResult:
     """
     Find and create links between ALL claims in a library.
@@ -659,6 +712,8 @@ def link_claims_in_library(
         library_id: UUID of the library to process
         similarity_threshold: Minimum cosine similarity to consider claims related
         job_id: Optional job ID for associating saved links
+        claims: Optional library claims from _fetch_claims_with_embeddings,
+            if the caller already fetched them
 
     Returns:
         C2CLinkingResult with all discovered links, usage stats, and save count
@@ -667,8 +722,9 @@ def link_claims_in_library(
     logger.info(f"Starting full claim-to-claim linking for library_id={library_id_str}")
 
     # Fetch all claims with embeddings
-    claims = _fetch_claims_with_embeddings(library_id_str)
-    logger.info(f"Fetched {len(claims)} claims with embeddings from library")
+    if claims is None:
+        claims = _fetch_claims_with_embeddings(library_id_str)
+        logger.info(f"Fetched {len(claims)} claims with embeddings from library")
 
     if len(claims) < 2:
         logger.info("Not enough claims to link")
@@ -687,13 +743,14 @@ def link_claims_in_library(
     valid_claim_ids = {c["id"] for c in claims}
 
     # Use link_claims with all claims as input (full library mode)
-    # Pass claims directly - they already have embeddings
+    # Pass claims directly - they already have embeddings and are also the library
     return link_claims(
         input_claims=claims,
         library_id=library_id,
         similarity_threshold=similarity_threshold,
         job_id=job_id,
         valid_claim_ids=valid_claim_ids,
+        library_claims=claims,
     )
 
 
@@ -1,25 +1,29 @@
-"""Pairwise claim linking - one LLM call per candidate pair.
+"""Pairwise claim linking - candidate pairs classified PAIRS_PER_CALL at a time.
 
 This approach avoids UUID hallucination by never asking the LLM to return UUIDs.
-Instead, we pass exactly two claims and ask for a link type (or None).
+Instead, each pair carries a small integer pair_id and the LLM returns a link
+type (or none) per pair_id. Pairs missing from a batch response are retried
+one at a time.
 """
 import asyncio
 import logging
+import time
 from dataclasses import dataclass
 from typing import Optional
 from uuid import UUID
 
 import dspy
 import numpy as np
+import orjson
 from pydantic import BaseModel, Field
 
 from db import ExtractQueries, VectorQueries
+from services.async_runner import run_async
 from services.link.claim2claim import (
     ClaimLink,
     ClaimLinkType,
     LinkingResult,
     add_embeddings_to_claims,
-    _asymmetric_cosine_similarity,
     _fetch_claims_with_embeddings,
 )
 
@@ -86,11 +90,117 @@ class PairwiseLinker(dspy.Module):
         result = self.classify(claim_1=claim_1, claim_2=claim_2)
         return result.result
 
+    async def aforward(self, claim_1: str, claim_2: str) -> PairwiseLinkResult:
+        """Classify the relationship between two claims without blocking the event loop."""
+        result = await self.classify.acall(claim_1=claim_1, claim_2=claim_2)
+        return result.result
+
+
+class PairBatchResult(PairwiseLinkResult):
+    """Result for one pair within a batch of pairs."""
+
+    pair_id: int = Field(description="pair_id of the input pair this result belongs to")
+
+
+class ClassifyClaimPairBatch(dspy.Signature):
+    """
+    Determine for each of several pairs of scientific claims whether the two claims have a meaningful relationship.
+
+    Every pair is independent - judge each one only on its own two claims.
+    Classify each pair's relationship:
+    - NONE: No meaningful relationship
+    - DUPLICATE: Claims say the same thing in different words
+    - VARIANT: Claims talk about the exact same phenomenon or relationship but differ
+        in some detail about their nature. Variant claims extend their counter part,
+        impose different conditions, etc. Two variant claims can be true at the same time.
+        Importantly, claims are not variants of each other just because they touch upon the same topic.
+        They need to be about the exact same relationship or phenomenon to be variants.
+    - CONTRADICTION: Claims directly disagree and cannot both be true
+    - PREMISE_1_TO_2: Claim 1 is a logical premise/foundation for Claim 2
+    - PREMISE_2_TO_1: Claim 2 is a logical premise/foundation for Claim 1
+
+    Return exactly one result per input pair, tagged with that pair's pair_id.
+    """
+
+    pairs_json: str = dspy.InputField(desc="JSON array of pairs with pair_id, claim_1 and claim_2 text")
+    results: list[PairBatchResult] = dspy.OutputField(desc="One classification result per input pair")
+
+
+class PairwiseBatchLinker(dspy.Module):
+    """DSPy module for classifying several independent pairs of claims in one call."""
+
+    def __init__(self):
+        super().__init__()
+        self.classify = dspy.Predict(ClassifyClaimPairBatch)
+
+    def forward(self, pairs_json: str) -> list[PairBatchResult]:
+        """Classify the relationship within each pair."""
+        result = self.classify(pairs_json=pairs_json)
+        return result.results
+
+    async def aforward(self, pairs_json: str) -> list[PairBatchResult]:
+        """Classify the relationship within each pair without blocking the event loop."""
+        result = await self.classify.acall(pairs_json=pairs_json)
+        return result.results
+
+
+# --- Library Embeddings ---
+
+
+def _normalize_rows(embeddings: np.ndarray) -> np.ndarray:
+    """L2-normalize each row of an embedding matrix in place and return it."""
+    # Clamp zero norms so an all-zero embedding stays a zero row instead of NaNs
+    embeddings /= np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+    return embeddings
+
+
+def _embedding_matrix(claims: list[dict]) -> np.ndarray:
+    """
+    Stack claim embeddings into a float32 (n_claims, d) matrix.
+
+    The matrix is allocated once and filled row by row, instead of going
+    through an intermediate list of lists.
+    """
+    matrix = np.empty((len(claims), len(claims[0]["embedding"])), dtype=np.float32)
+    for i, claim in enumerate(claims):
+        matrix[i] = claim["embedding"]
+    return matrix
+
+
+def _get_library_claims(
+    library_id: str,
+    claims: list[dict] | None = None,
+) -> tuple[list[dict], np.ndarray]:
+    """
+    Get library claims with embeddings plus their normalized embedding matrix.
+
+    Args:
+        library_id: UUID of the library
+        claims: Library claims the caller already fetched with
+            _fetch_claims_with_embeddings (skips the fetch)
+
+    Returns:
+        Tuple of (claims, normalized matrix with one row per claim)
+    """
+    if claims is None:
+        claims = _fetch_claims_with_embeddings(library_id)
+    if claims:
+        normalized = _normalize_rows(_embedding_matrix(claims))
+    else:
+        normalized = np.empty((0, 0), dtype=np.float32)
+
+    return claims, normalized
+
+
+def _normalized_similarity(input_normalized: np.ndarray, library_normalized: np.ndarray) -> np.ndarray:
+    """Cosine similarity matrix (n_input, n_library) from L2-normalized embeddings."""
+    return input_normalized @ library_normalized.T
+
 
 # --- Candidate Pair Generation ---
 
 
-@dataclass
+@dataclass(slots=True)
 class CandidatePair:
     """A pair of claims to evaluate."""
 
@@ -101,61 +211,107 @@ class CandidatePair:
     similarity: float
 
 
+def _make_candidate_pair(claim_1: dict, claim_2: dict, similarity: float) -> CandidatePair:
+    """Build a CandidatePair from two claim dicts."""
+    return CandidatePair(
+        claim_1_id=claim_1["id"],
+        claim_1_text=claim_1["content"].get("rephrased_claim", ""),
+        claim_2_id=claim_2["id"],
+        claim_2_text=claim_2["content"].get("rephrased_claim", ""),
+        similarity=float(similarity),
+    )
+
+
+def _dedupe_pairs(
+    input_claims: list[dict],
+    library_claims: list[dict],
+    rows: list[int],
+    cols: list[int],
+    similarities: list[float],
+) -> list[CandidatePair]:
+    """Build pairs from (input row, library col) matches, skipping self-pairs and repeats."""
+    pairs = []
+    seen = set()  # Track (min_id, max_id) to avoid duplicates
+    for i, j, similarity in zip(rows, cols, similarities):
+        id_1 = input_claims[i]["id"]
+        id_2 = library_claims[j]["id"]
+
+        # Skip self-comparison
+        if id_1 == id_2:
+            continue
+
+        # Deduplicate: order-independent key without list/sort allocation
+        pair_key = (id_1, id_2) if id_1 < id_2 else (id_2, id_1)
+        if pair_key in seen:
+            continue
+        seen.add(pair_key)
+
+        pairs.append(_make_candidate_pair(input_claims[i], library_claims[j], similarity))
+    return pairs
+
+
+# Max library claims considered per input claim (bounds LLM calls to K * |input|)
+DEFAULT_TOP_K = 25
+
+
 def build_candidate_pairs(
     input_claims: list[dict],
     library_claims: list[dict],
     threshold: float = 0.35,
+    top_k: int | None = DEFAULT_TOP_K,
+    library_normalized: np.ndarray | None = None,
 ) -> list[CandidatePair]:
     """
     Build list of candidate pairs above similarity threshold.
 
     Uses asymmetric similarity: only pairs where at least one claim is from input_claims.
+    For each input claim only the top_k most similar library claims are considered
+    (pass top_k=None to consider all library claims above threshold).
+
+    If library_normalized (L2-normalized library embeddings, row-aligned with
+    library_claims) is given, the library side is not rebuilt or renormalized.
     """
     if not input_claims or not library_claims:
         return []
 
-    # Build embeddings matrices
-    input_embeddings = np.array([c["embedding"] for c in input_claims])
-    library_embeddings = np.array([c["embedding"] for c in library_claims])
-
     # Compute similarity
-    similarity_matrix = _asymmetric_cosine_similarity(input_embeddings, library_embeddings)
+    input_normalized = _normalize_rows(_embedding_matrix(input_claims))
 
-    # Build ID sets for deduplication
-    input_ids = {c["id"] for c in input_claims}
+    if library_normalized is None:
+        library_normalized = _normalize_rows(_embedding_matrix(library_claims))
+    similarity_matrix = _normalized_similarity(input_normalized, library_normalized)
+
+    # Bound candidates per input claim. argpartition is O(M) per row, no full sort.
+    # One extra slot is kept because the claim itself is usually its own best match.
+    n_library = len(library_claims)
+    if top_k is not None and top_k + 1 < n_library:
+        candidate_idx = np.argpartition(-similarity_matrix, top_k, axis=1)[:, : top_k + 1]
+        candidate_mask = np.zeros(similarity_matrix.shape, dtype=bool)
+        np.put_along_axis(candidate_mask, candidate_idx, True, axis=1)
+    else:
+        candidate_mask = np.ones(similarity_matrix.shape, dtype=bool)
+
+    # Skip pairs below threshold
+    candidate_mask &= similarity_matrix >= threshold
 
-    # Collect candidate pairs
     pairs = []
-    seen = set()  # Track (min_id, max_id) to avoid duplicates
 
-    for i, input_claim in enumerate(input_claims):
-        for j, lib_claim in enumerate(library_claims):
-            # Skip self-comparison
-            if input_claim["id"] == lib_claim["id"]:
-                continue
-
-            # Skip if below threshold
-            sim = similarity_matrix[i, j]
-            if sim < threshold:
-                continue
-
-            # Deduplicate: use sorted IDs as key
-            pair_key = tuple(sorted([input_claim["id"], lib_claim["id"]]))
-            if pair_key in seen:
-                continue
-            seen.add(pair_key)
-
-            # Get claim text
-            claim_1_text = input_claim["content"].get("rephrased_claim", "")
-            claim_2_text = lib_claim["content"].get("rephrased_claim", "")
-
-            pairs.append(CandidatePair(
-                claim_1_id=input_claim["id"],
-                claim_1_text=claim_1_text,
-                claim_2_id=lib_claim["id"],
-                claim_2_text=claim_2_text,
-                similarity=float(sim),
-            ))
+    if [c["id"] for c in input_claims] == [c["id"] for c in library_claims]:
+        # Library mode: same claims on both axes, so the matrix is symmetric.
+        # Keep a pair if either side selected it, and read each pair exactly
+        # once from the upper triangle (k=1 also drops self-comparisons).
+        rows, cols = np.nonzero(np.triu(candidate_mask | candidate_mask.T, k=1))
+        for i, j in zip(rows.tolist(), cols.tolist()):
+            pairs.append(_make_candidate_pair(input_claims[i], library_claims[j], similarity_matrix[i, j]))
+    else:
+        rows, cols = np.nonzero(candidate_mask)
+        pairs = _dedupe_pairs(
+            input_claims,
+            library_claims,
+            rows.tolist(),
+            cols.tolist(),
+            similarity_matrix[rows, cols].tolist(),
+        )
 
     logger.info(f"Built {len(pairs)} candidate pairs above threshold {threshold}")
     return pairs
@@ -164,7 +320,7 @@ def build_candidate_pairs(
 # --- Token/Cost Tracking ---
 
 
-@dataclass
+@dataclass(slots=True)
 class UsageStats:
     """Aggregated usage statistics."""
 
@@ -181,70 +337,235 @@ class UsageStats:
         self.total_cost += cost or 0.0
 
 
-# --- Async Processing ---
+# --- Rate Limiting ---
+
+
+class AsyncRateLimiter:
+    """
+    Token-bucket rate limiter for async callers.
 
-from concurrent.futures import ThreadPoolExecutor
+    The bucket holds up to `capacity` units and refills continuously at
+    `capacity` units per `period` seconds. Callers await `wait(amount)` before
+    doing work; it returns once enough units are available.
+    """
+
+    def __init__(self, capacity: float, period: float = 60.0):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    async def wait(self, amount: float = 1.0) -> None:
+        """Block until `amount` units can be taken from the bucket."""
+        # Requests larger than the bucket would never fit - cap them
+        amount = min(amount, self.capacity)
+        while True:
+            async with self._lock:
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+                delay = (amount - self._tokens) / self.rate
+            # Sleep outside the lock so other waiters can take what fits meanwhile
+            await asyncio.sleep(delay)
+
+
+# --- Async Processing ---
 
 MAX_CONCURRENT_REQUESTS = 50
 
-# Explicit thread pool for I/O-bound API calls (default is only 32)
-_executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS)
+# Provider limits for the pairwise run (requests and tokens per minute)
+MAX_REQUESTS_PER_MINUTE = 500
+MAX_TOKENS_PER_MINUTE = 200_000
+
+# Fixed per-call overhead: signature instructions plus structured output
+ESTIMATED_PROMPT_TOKENS = 600
+
+# Pairs classified per LLM call (1 = one call per pair)
+PAIRS_PER_CALL = 10
+
+# Suggested cut-off for linking near-identical pairs as duplicates without an
+# LLM call. Not validated against labelled pairs, so it is opt-in: pass it as
+# duplicate_threshold to enable the shortcut.
+DUPLICATE_SIMILARITY = 0.97
+
+
+def _estimate_tokens(pairs: list[CandidatePair]) -> int:
+    """Rough input+output token estimate for one call over these pairs (~4 chars per token)."""
+    chars = sum(len(p.claim_1_text) + len(p.claim_2_text) for p in pairs)
+    return chars // 4 + ESTIMATED_PROMPT_TOKENS
+
+
+def _split_near_duplicates(
+    pairs: list[CandidatePair],
+    duplicate_threshold: float | None,
+) -> tuple[list[ClaimLink], list[CandidatePair]]:
+    """
+    Split off pairs similar enough to be linked as duplicates directly.
+
+    Returns:
+        (duplicate links, pairs that still need LLM classification)
+    """
+    if duplicate_threshold is None:
+        return [], pairs
+
+    duplicate_links: list[ClaimLink] = []
+    remaining: list[CandidatePair] = []
+    for pair in pairs:
+        if pair.similarity >= duplicate_threshold:
+            duplicate_links.append(
+                ClaimLink(
+                    claim_id_1=pair.claim_1_id,
+                    claim_id_2=pair.claim_2_id,
+                    link_type=ClaimLinkType.duplicate,
+                    strength=None,
+                    reasoning=f"Embedding similarity {pair.similarity:.3f} >= {duplicate_threshold}",
+                )
+            )
+        else:
+            remaining.append(pair)
+    return duplicate_links, remaining
+
+
+def _to_claim_link(pair: CandidatePair, result: PairwiseLinkResult) -> Optional[ClaimLink]:
+    """Map a pairwise classification to a ClaimLink (None if no relationship)."""
+    if result.link_type == PairwiseLinkType.none:
+        return None
+
+    if result.link_type == PairwiseLinkType.premise_1_to_2:
+        return ClaimLink(
+            claim_id_1=pair.claim_1_id,
+            claim_id_2=pair.claim_2_id,
+            link_type=ClaimLinkType.premise,
+            strength=None,
+            reasoning=result.reasoning,
+        )
+    elif result.link_type == PairwiseLinkType.premise_2_to_1:
+        return ClaimLink(
+            claim_id_1=pair.claim_2_id,
+            claim_id_2=pair.claim_1_id,
+            link_type=ClaimLinkType.premise,
+            strength=None,
+            reasoning=result.reasoning,
+        )
+    else:
+        # Symmetric types: duplicate, variant, contradiction
+        return ClaimLink(
+            claim_id_1=pair.claim_1_id,
+            claim_id_2=pair.claim_2_id,
+            link_type=ClaimLinkType(result.link_type.value),
+            strength=None,
+            reasoning=result.reasoning,
+        )
 
 
 async def _process_pair(
     semaphore: asyncio.Semaphore,
+    request_limiter: AsyncRateLimiter,
+    token_limiter: AsyncRateLimiter,
     linker: PairwiseLinker,
     pair: CandidatePair,
     pair_idx: int,
 ) -> Optional[ClaimLink]:
-    """Process a single pair with semaphore-controlled concurrency."""
+    """Process a single pair with concurrency, RPM and TPM limits."""
     async with semaphore:
-        logger.debug(f"Processing pair {pair_idx + 1}: {pair.claim_1_id[:8]}... <-> {pair.claim_2_id[:8]}...")
-
-        try:
-            # Run DSPy in thread pool
-            loop = asyncio.get_event_loop()
-            result: PairwiseLinkResult = await loop.run_in_executor(
-                _executor, linker, pair.claim_1_text, pair.claim_2_text
-            )
+        # %-style args: only formatted if debug logging is enabled (runs once per pair)
+        logger.debug("Processing pair %d: %.8s... <-> %.8s...", pair_idx + 1, pair.claim_1_id, pair.claim_2_id)
 
-            # Convert to ClaimLink if there's a relationship
-            if result.link_type == PairwiseLinkType.none:
-                return None
+        await request_limiter.wait()
+        await token_limiter.wait(_estimate_tokens([pair]))
 
-            # Map pairwise result to ClaimLink
-            if result.link_type == PairwiseLinkType.premise_1_to_2:
-                return ClaimLink(
-                    claim_id_1=pair.claim_1_id,
-                    claim_id_2=pair.claim_2_id,
-                    link_type=ClaimLinkType.premise,
-                    reasoning=result.reasoning,
-                )
-            elif result.link_type == PairwiseLinkType.premise_2_to_1:
-                return ClaimLink(
-                    claim_id_1=pair.claim_2_id,
-                    claim_id_2=pair.claim_1_id,
-                    link_type=ClaimLinkType.premise,
-                    reasoning=result.reasoning,
-                )
-            else:
-                # Symmetric types: duplicate, variant, contradiction
-                return ClaimLink(
-                    claim_id_1=pair.claim_1_id,
-                    claim_id_2=pair.claim_2_id,
-                    link_type=ClaimLinkType(result.link_type.value),
-                    reasoning=result.reasoning,
-                )
+        try:
+            # Native async DSPy call - no thread per in-flight request
+            result: PairwiseLinkResult = await linker.acall(pair.claim_1_text, pair.claim_2_text)
+            return _to_claim_link(pair, result)
 
         except Exception as e:
             logger.error(f"Error processing pair {pair_idx + 1}: {e}")
             return None
 
 
-def _aggregate_usage_from_history() -> UsageStats:
-    """Aggregate usage stats from all LM history entries."""
+async def _process_pair_chunk(
+    semaphore: asyncio.Semaphore,
+    request_limiter: AsyncRateLimiter,
+    token_limiter: AsyncRateLimiter,
+    batch_linker: PairwiseBatchLinker,
+    linker: PairwiseLinker,
+    chunk: list[CandidatePair],
+    chunk_start: int,
+) -> list[ClaimLink]:
+    """
+    Classify a chunk of pairs in a single LLM call.
+
+    Pairs whose result is missing from the batch response (or the whole chunk,
+    if the call fails) are retried individually with _process_pair.
+    """
+    if len(chunk) == 1:
+        link = await _process_pair(semaphore, request_limiter, token_limiter, linker, chunk[0], chunk_start)
+        return [link] if link is not None else []
+
+    results_by_id: dict[int, PairwiseLinkResult] = {}
+
+    async with semaphore:
+        logger.debug("Processing pairs %d-%d", chunk_start + 1, chunk_start + len(chunk))
+
+        await request_limiter.wait()
+        await token_limiter.wait(_estimate_tokens(chunk))
+
+        pairs_json = orjson.dumps([
+            {"pair_id": i, "claim_1": pair.claim_1_text, "claim_2": pair.claim_2_text}
+            for i, pair in enumerate(chunk)
+        ]).decode()
+
+        try:
+            batch_results = await batch_linker.acall(pairs_json)
+            results_by_id = {r.pair_id: r for r in batch_results if 0 <= r.pair_id < len(chunk)}
+        except Exception as e:
+            logger.error(f"Error processing pairs {chunk_start + 1}-{chunk_start + len(chunk)}: {e}")
+
+    links: list[ClaimLink] = []
+    retry_tasks = []
+    for i, pair in enumerate(chunk):
+        result = results_by_id.get(i)
+        if result is None:
+            retry_tasks.append(
+                _process_pair(semaphore, request_limiter, token_limiter, linker, pair, chunk_start + i)
+            )
+            continue
+        link = _to_claim_link(pair, result)
+        if link is not None:
+            links.append(link)
+
+    if retry_tasks:
+        logger.info(f"Retrying {len(retry_tasks)} pairs individually from chunk at pair {chunk_start + 1}")
+        retried = await asyncio.gather(*retry_tasks)
+        links.extend(link for link in retried if link is not None)
+
+    return links
+
+
+def _prompt_cache_kwargs(model: str) -> dict:
+    """
+    LM kwargs that let the shared instruction prefix be served from the provider's prompt cache.
+
+    DSPy puts the signature instructions in the system message, which is
+    identical across every call of a run. OpenAI caches such prefixes
+    automatically; Anthropic needs the system message marked explicitly.
+    """
+    if model.startswith("anthropic/"):
+        return {"cache_control_injection_points": [{"location": "message", "role": "system"}]}
+    return {}
+
+
+def _aggregate_usage_from_history(lm: dspy.LM | None) -> UsageStats:
+    """Aggregate usage stats from all history entries of the given LM."""
     stats = UsageStats()
-    lm = dspy.settings.lm
     if lm and lm.history:
         for entry in lm.history:
             usage = entry.get("usage", {})
@@ -256,35 +577,66 @@ def _aggregate_usage_from_history() -> UsageStats:
 async def _link_pairs_async(
     pairs: list[CandidatePair],
     max_concurrent: int = MAX_CONCURRENT_REQUESTS,
+    requests_per_minute: int = MAX_REQUESTS_PER_MINUTE,
+    tokens_per_minute: int = MAX_TOKENS_PER_MINUTE,
+    pairs_per_call: int = PAIRS_PER_CALL,
+    duplicate_threshold: float | None = None,
 ) -> tuple[list[ClaimLink], UsageStats]:
-    """Run linking on all pairs concurrently."""
+    """
+    Run linking on all pairs concurrently, gated by concurrency, RPM and TPM.
+
+    Every pair is classified by the LLM unless duplicate_threshold is given
+    (e.g. DUPLICATE_SIMILARITY). Pairs at or above it are then linked as
+    duplicates without an LLM call.
+
+    Pairs are sent pairs_per_call at a time, so the shared instructions and
+    per-request latency are paid once per chunk rather than once per pair.
+    """
     semaphore = asyncio.Semaphore(max_concurrent)
+    request_limiter = AsyncRateLimiter(requests_per_minute)
+    token_limiter = AsyncRateLimiter(tokens_per_minute)
     linker = PairwiseLinker()
+    batch_linker = PairwiseBatchLinker()
+    pairs_per_call = max(1, pairs_per_call)
 
-    # Clear history before run so we only capture this batch
+    # Run on a private copy of the configured LM: its history holds exactly
+    # this run's calls, so concurrent runs never clear or read each other's
+    # entries in the shared global LM. The copy also carries the prompt
+    # caching kwargs so the instructions are only billed in full once.
     lm = dspy.settings.lm
-    if lm:
-        lm.history.clear()
-
-    tasks = [
-        _process_pair(semaphore, linker, pair, i)
-        for i, pair in enumerate(pairs)
-    ]
+    run_lm = lm.copy(**_prompt_cache_kwargs(lm.model)) if lm else None
+
+    links, pairs = _split_near_duplicates(pairs, duplicate_threshold)
+    if links:
+        logger.info(f"Linked {len(links)} near-identical pairs as duplicates without LLM calls")
+
+    with dspy.context(lm=run_lm):
+        tasks = [
+            _process_pair_chunk(
+                semaphore,
+                request_limiter,
+                token_limiter,
+                batch_linker,
+                linker,
+                pairs[start : start + pairs_per_call],
+                start,
+            )
+            for start in range(0, len(pairs), pairs_per_call)
+        ]
 
-    results = await asyncio.gather(*tasks)
+        for chunk_links in await asyncio.gather(*tasks):
+            links.extend(chunk_links)
 
-    # Aggregate usage from all history entries after completion
-    stats = _aggregate_usage_from_history()
+    # Aggregate usage from this run's calls only
+    stats = _aggregate_usage_from_history(run_lm)
 
-    # Filter out None results
-    links = [r for r in results if r is not None]
     return links, stats
 
 
 # --- Main Entry Points ---
 
 
-@dataclass
+@dataclass(slots=True)
 class PairwiseLinkingResult:
     """Result with usage stats."""
 
@@ -296,14 +648,18 @@ def link_claims_pairwise(
     input_claims: list[dict],
     library_id: str | UUID,
     similarity_threshold: float = 0.35,
+    library_claims: list[dict] | None = None,
 ) -> PairwiseLinkingResult:
     """
-    Find links using pairwise classification (one LLM call per candidate pair).
+    Find links using pairwise classification of candidate pairs.
 
     This approach:
     - Never asks LLM to return UUIDs (avoids hallucination)
-    - Makes one call per candidate pair above similarity threshold
+    - Sends candidate pairs above the similarity threshold PAIRS_PER_CALL per LLM call
     - Returns detailed usage statistics for cost analysis
+
+    library_claims may pass in the library's claims when the caller already
+    fetched them.
     """
     library_id_str = str(library_id)
     logger.info(f"Starting pairwise claim linking for library_id={library_id_str}")
@@ -321,7 +677,9 @@ def link_claims_pairwise(
         )
 
     # Fetch library claims
-    library_claims = _fetch_claims_with_embeddings(library_id_str)
+    library_claims, library_normalized = _get_library_claims(
+        library_id_str, claims=library_claims
+    )
     logger.info(f"Fetched {len(library_claims)} claims from library")
 
     if len(library_claims) < 2:
@@ -336,7 +694,12 @@ def link_claims_pairwise(
         )
 
     # Build candidate pairs
-    pairs = build_candidate_pairs(input_claims, library_claims, similarity_threshold)
+    pairs = build_candidate_pairs(
+        input_claims,
+        library_claims,
+        similarity_threshold,
+        library_normalized=library_normalized,
+    )
 
     if not pairs:
         return PairwiseLinkingResult(
@@ -350,7 +713,7 @@ def link_claims_pairwise(
         )
 
     # Process all pairs
-    links, stats = asyncio.run(_link_pairs_async(pairs))
+    links, stats = run_async(_link_pairs_async(pairs))
 
     logger.info(f"Found {len(links)} links from {len(pairs)} candidate pairs")
     logger.info(f"Usage: {stats.total_input_tokens} input tokens, {stats.total_output_tokens} output tokens")
@@ -370,12 +733,15 @@ def link_claims_pairwise(
 def link_claims_in_library_pairwise(
     library_id: str | UUID,
     similarity_threshold: float = 0.35,
+    claims: list[dict] | None = None,
 ) -> PairwiseLinkingResult:
     """
     Full library pairwise linking - compare all claims against each other.
+
+    Pass claims (from _fetch_claims_with_embeddings) to reuse an earlier fetch.
     """
     library_id_str = str(library_id)
-    claims = _fetch_claims_with_embeddings(library_id_str)
+    claims, _ = _get_library_claims(library_id_str, claims=claims)
 
     if len(claims) < 2:
         return PairwiseLinkingResult(
@@ -392,4 +758,5 @@ def link_claims_in_library_pairwise(
         input_claims=claims,
         library_id=library_id,
         similarity_threshold=similarity_threshold,
+        library_claims=claims,
     )
@@ -1,15 +1,22 @@
 """Link claims to observations (evidence) within a library using DSPy."""
 import asyncio
 import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Callable
+from typing import Any, Callable, Iterable
 from uuid import UUID
 
 import dspy
-from pydantic import BaseModel, Field
+import numpy as np
+import orjson
+from pydantic import BaseModel, Field, TypeAdapter
 
-from db import ExtractQueries, VectorQueries
+from db import ExtractQueries
+from services.async_runner import run_async
 from services.link.claim2claim import UsageStats, add_paper_titles_to_claims
+from services.link.db_utils import save_c2o_links
+from services.link.method_selector import select_methods_for_claims
 
 logger = logging.getLogger(__name__)
 
@@ -43,6 +50,10 @@ class EvidenceLink(BaseModel):
     reasoning: str = Field(description="Brief explanation of how the observation relates to the claim")
 
 
+# Serializes a whole list of links in one pydantic-core call (vs model_dump per link)
+_LINKS_ADAPTER = TypeAdapter(list[EvidenceLink])
+
+
 class EvidenceGroup(BaseModel):
     """A group containing one claim and candidate observations to evaluate."""
 
@@ -103,6 +114,37 @@ class LinkClaimToObservations(dspy.Signature):
     links: list[EvidenceLink] = dspy.OutputField(desc="List of identified evidence links")
 
 
+class LinkClaimsToObservations(dspy.Signature):
+    """
+    Identify evidential relationships between several scientific claims and provided observations.
+
+    Given a few claims (usually from the same paper) and a set of observations (empirical
+    findings, measurements, experimental results) from papers in a research library, identify
+    which observations serve as evidence for or against each claim. Judge every claim separately.
+
+    Evidential relationships:
+    - SUPPORTS: The observation provides empirical evidence supporting the claim. It is a specific instance of the claim's general assertion.
+    - CONTRADICTS: The observation provides empirical evidence against the claim. If the claim were true as it is, we would not be able to make this observation.
+    - CONTEXTUALIZES: The observation provides relevant context (scope, conditions, related findings)
+      without directly supporting or contradicting the claim
+
+    Only create links where there is a clear evidential relationship in the empirical, scientific sense.
+    Use the observation and claim ids provided in the input in your response.
+
+    If the method examines the exact phenomenon or relationship a claim addresses, it's likely that the observations
+    coming out of it provide evidence for or against that claim.
+    If the method doesn't directly examine the exact phenomenon or relationship but relevant and related concepts,
+    there's probably some observations being made that provide relevant context to the claim.
+    """
+
+    claims_json: str = dspy.InputField(desc="JSON array of claims with id and text")
+    observations_json: str = dspy.InputField(desc="""
+        JSON object with observations and context of the methods/studies that produced them.
+        Contains observations from the literature and potentially from same paper as the claims (if so they are marked as such).
+    """)
+    links: list[EvidenceLink] = dspy.OutputField(desc="List of identified evidence links across all claims")
+
+
 # --- DSPy Module ---
 
 
@@ -118,6 +160,29 @@ class EvidenceLinker(dspy.Module):
         result = self.link(claim_json=claim_json, observations_json=observations_json)
         return result.links
 
+    async def aforward(self, claim_json: str, observations_json: str) -> list[EvidenceLink]:
+        """Find evidence links without blocking the event loop."""
+        result = await self.link.acall(claim_json=claim_json, observations_json=observations_json)
+        return result.links
+
+
+class GroupEvidenceLinker(dspy.Module):
+    """DSPy module for linking several claims to a shared set of observations in one call."""
+
+    def __init__(self):
+        super().__init__()
+        self.link = dspy.Predict(LinkClaimsToObservations)
+
+    def forward(self, claims_json: str, observations_json: str) -> list[EvidenceLink]:
+        """Find evidence links between the claims and observations."""
+        result = self.link(claims_json=claims_json, observations_json=observations_json)
+        return result.links
+
+    async def aforward(self, claims_json: str, observations_json: str) -> list[EvidenceLink]:
+        """Find evidence links without blocking the event loop."""
+        result = await self.link.acall(claims_json=claims_json, observations_json=observations_json)
+        return result.links
+
 
 # --- Preselection ---
 
@@ -147,9 +212,9 @@ def _preselect_observations_for_claim(
     Returns:
         List of candidate observation dicts for this claim
     """
-    from services.link.method_selector import select_methods_for_claims
-
-    candidate_obs_ids = set()
+    # The lookups already hold the observation dicts - collect them by id
+    # instead of rescanning all observations
+    candidates: dict[str, dict] = {}
 
     # Use LLM to select relevant methods (if methods available)
     if methods:
@@ -160,18 +225,61 @@ def _preselect_observations_for_claim(
         # Add observations from selected methods
         for method_id in selected_method_ids:
             for obs in observations_by_method.get(method_id, []):
-                candidate_obs_ids.add(obs["id"])
+                candidates[obs["id"]] = obs
 
     # Always include observations from the same paper as the claim
     claim_paper_id = claim.get("paper_id")
     if claim_paper_id:
         for obs in observations_by_paper.get(claim_paper_id, []):
-            candidate_obs_ids.add(obs["id"])
+            candidates[obs["id"]] = obs
+
+    return list(candidates.values())
+
+
+# Most similar observations per claim kept as candidates (in addition to same-paper observations)
+OBSERVATIONS_PER_CLAIM = 30
 
-    # Build observation list
-    if candidate_obs_ids:
-        return [obs for obs in observations if obs["id"] in candidate_obs_ids]
-    return []
+
+def _normalized_embedding_matrix(items: list[dict]) -> np.ndarray:
+    """Stack the 'embedding' of each item into an L2-normalized float32 matrix."""
+    matrix = np.asarray([item["embedding"] for item in items], dtype=np.float32)
+    # Clamp zero norms so an all-zero embedding stays a zero row instead of NaNs
+    matrix /= np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+    return matrix
+
+
+def _similar_observation_indices(
+    claims: list[dict],
+    observation_matrix: np.ndarray,
+    top_k: int = OBSERVATIONS_PER_CLAIM,
+) -> dict[str, np.ndarray]:
+    """
+    Find the top_k most similar observations for each claim by embedding cosine similarity.
+
+    A single (n_claims, n_observations) matmul replaces one method-selection
+    LLM call per claim.
+
+    Args:
+        claims: Claim dicts with 'id' and 'embedding'
+        observation_matrix: Normalized observation embeddings, one row per observation
+        top_k: Number of observations to keep per claim
+
+    Returns:
+        Dict mapping claim_id -> array of candidate observation row indices
+    """
+    n_observations = observation_matrix.shape[0]
+    if not claims or n_observations == 0:
+        return {}
+
+    similarity = _normalized_embedding_matrix(claims) @ observation_matrix.T
+
+    # argpartition gives the top_k per row without a full sort
+    if top_k < n_observations:
+        top_idx = np.argpartition(-similarity, top_k, axis=1)[:, :top_k]
+    else:
+        top_idx = np.broadcast_to(np.arange(n_observations), similarity.shape)
+
+    return {claim["id"]: row for claim, row in zip(claims, top_idx)}
 
 
 def _build_observation_lookups(
@@ -207,45 +315,44 @@ def _build_observation_lookups(
 # --- Data Fetching ---
 
 
-def _fetch_claims_with_embeddings(library_id: str) -> list[dict]:
+def _fetch_extracts_with_embeddings(library_id: str, extract_type: str) -> list[dict]:
     """
-    Fetch all claims for a library with their embeddings.
+    Fetch all extracts of a type for a library with their embeddings in one query.
 
     Args:
         library_id: UUID of the library
+        extract_type: Type of extract ('claim', 'observation')
 
     Returns:
-        List of claim dicts, each with an 'embedding' key
+        List of extract dicts, each with an 'embedding' key (extracts without one are skipped)
     """
-    import json
+    extracts = ExtractQueries().get_extracts_with_embeddings_by_library(library_id, extract_type)
+
+    extracts_with_embeddings = []
+    for extract in extracts:
+        emb = extract["embedding"]
+        if emb is None:
+            logger.warning(f"{extract_type.capitalize()} {extract['id']} has no embedding, skipping")
+            continue
+        # pgvector columns come back as text through PostgREST
+        if isinstance(emb, str):
+            extract["embedding"] = orjson.loads(emb)
+        extracts_with_embeddings.append(extract)
 
-    extracts = ExtractQueries()
-    vectors = VectorQueries()
+    return extracts_with_embeddings
 
-    claims = extracts.get_claims_by_library(library_id)
-    if not claims:
-        return []
 
-    claim_ids = [c["id"] for c in claims]
-    vector_records = vectors.get_by_extract_ids(claim_ids)
+def _fetch_claims_with_embeddings(library_id: str) -> list[dict]:
+    """
+    Fetch all claims for a library with their embeddings.
 
-    embedding_by_id = {}
-    for v in vector_records:
-        emb = v["embedding"]
-        if isinstance(emb, str):
-            emb = json.loads(emb)
-        embedding_by_id[v["extract_id"]] = emb
-
-    claims_with_embeddings = []
-    for claim in claims:
-        embedding = embedding_by_id.get(claim["id"])
-        if embedding is not None:
-            claim["embedding"] = embedding
-            claims_with_embeddings.append(claim)
-        else:
-            logger.warning(f"Claim {claim['id']} has no embedding, skipping")
+    Args:
+        library_id: UUID of the library
 
-    return claims_with_embeddings
+    Returns:
+        List of claim dicts, each with an 'embedding' key
+    """
+    return _fetch_extracts_with_embeddings(library_id, "claim")
 
 
 def _fetch_observations_with_embeddings(library_id: str) -> list[dict]:
@@ -258,35 +365,7 @@ def _fetch_observations_with_embeddings(library_id: str) -> list[dict]:
     Returns:
         List of observation dicts, each with an 'embedding' key
     """
-    import json
-
-    extracts = ExtractQueries()
-    vectors = VectorQueries()
-
-    observations = extracts.get_observations_by_library(library_id)
-    if not observations:
-        return []
-
-    observation_ids = [o["id"] for o in observations]
-    vector_records = vectors.get_by_extract_ids(observation_ids)
-
-    embedding_by_id = {}
-    for v in vector_records:
-        emb = v["embedding"]
-        if isinstance(emb, str):
-            emb = json.loads(emb)
-        embedding_by_id[v["extract_id"]] = emb
-
-    observations_with_embeddings = []
-    for obs in observations:
-        embedding = embedding_by_id.get(obs["id"])
-        if embedding is not None:
-            obs["embedding"] = embedding
-            observations_with_embeddings.append(obs)
-        else:
-            logger.warning(f"Observation {obs['id']} has no embedding, skipping")
-
-    return observations_with_embeddings
+    return _fetch_extracts_with_embeddings(library_id, "observation")
 
 
 def _fetch_methods(library_id: str) -> list[dict]:
@@ -304,26 +383,95 @@ def _fetch_methods(library_id: str) -> list[dict]:
     return methods if methods else []
 
 
+# --- Library Observation Cache ---
+
+# Max libraries kept in the process-level observation cache
+OBSERVATION_CACHE_SIZE = 8
+
+# library_id -> (version, observations, observations_by_method, observations_by_paper)
+_observation_cache: OrderedDict[
+    str, tuple[str, list[dict], dict[str, list[dict]], dict[str, list[dict]]]
+] = OrderedDict()
+
+
+def _get_library_observations(
+    library_id: str,
+) -> tuple[list[dict], dict[str, list[dict]], dict[str, list[dict]]]:
+    """
+    Get a library's observations with embeddings plus their method/paper lookups.
+
+    Results are cached per library and reused while the library's observation
+    version (see ExtractQueries.get_library_extracts_version) is unchanged, so
+    repeated runs on the same library skip the fetch and the lookup build.
+    The version also moves when an observation gets its embedding, so a cached
+    entry never keeps hiding observations that were skipped for lacking one.
+
+    Returns:
+        Tuple of (observations, observations_by_method, observations_by_paper)
+    """
+    version = ExtractQueries().get_library_extracts_version(library_id, "observation")
+
+    cached = _observation_cache.get(library_id)
+    if cached is not None and version is not None and cached[0] == version:
+        _observation_cache.move_to_end(library_id)
+        logger.info(f"Using cached observations for library {library_id} ({len(cached[1])} observations)")
+        return cached[1], cached[2], cached[3]
+
+    observations = _fetch_observations_with_embeddings(library_id)
+    observations_by_method, observations_by_paper = _build_observation_lookups(observations)
+
+    if version is not None:
+        _observation_cache[library_id] = (version, observations, observations_by_method, observations_by_paper)
+        _observation_cache.move_to_end(library_id)
+        while len(_observation_cache) > OBSERVATION_CACHE_SIZE:
+            _observation_cache.popitem(last=False)
+
+    return observations, observations_by_method, observations_by_paper
+
+
 # --- Helper Functions ---
 
 
 def _format_claim_for_llm(claim: dict) -> str:
     """Format a single claim as JSON for the DSPy module."""
-    import json
-
     formatted = {
         "id": claim["id"],
         "paper_id": claim["paper_id"],
         "paper_title": claim.get("paper_title", ""),
         "claim": claim["content"].get("rephrased_claim", ""),
     }
-    return json.dumps(formatted, indent=2)
+    return orjson.dumps(formatted).decode()
+
+
+def _format_claims_for_llm(claims: list[dict]) -> str:
+    """Format several claims as a JSON array for the DSPy module."""
+    formatted = [
+        {
+            "id": claim["id"],
+            "paper_id": claim["paper_id"],
+            "paper_title": claim.get("paper_title", ""),
+            "claim": claim["content"].get("rephrased_claim", ""),
+        }
+        for claim in claims
+    ]
+    return orjson.dumps(formatted).decode()
+
+
+def _format_observation_for_llm(obs: dict) -> dict:
+    """Build the LLM-facing dict for a single observation (content minus internal fields)."""
+    obs_data = {"id": obs["id"]}
+    content = obs.get("content", {})
+    for key, value in content.items():
+        if key not in ("source_elements", "method_reference"):
+            obs_data[key] = value
+    return obs_data
 
 
 def _format_observations_for_llm(
     observations: list[dict],
     methods_lookup: dict[str, dict] | None = None,
     claim_paper_id: str | None = None,
+    formatted_by_id: dict[str, dict] | None = None,
 ) -> str:
     """Format observations as JSON for the DSPy module, grouped by method.
 
@@ -331,8 +479,10 @@ def _format_observations_for_llm(
         observations: List of observation dicts
         methods_lookup: Optional dict mapping method_id -> method dict for context
         claim_paper_id: Optional paper_id of the claim to separate same-paper observations
+        formatted_by_id: Optional precomputed _format_observation_for_llm output by observation id
     """
-    import json
+    if formatted_by_id is None:
+        formatted_by_id = {}
 
     # Separate same-paper vs general literature observations
     same_paper_obs = []
@@ -363,11 +513,9 @@ def _format_observations_for_llm(
 
             formatted_obs = []
             for obs in obs_in_method:
-                obs_data = {"id": obs["id"]}
-                content = obs.get("content", {})
-                for key, value in content.items():
-                    if key not in ("source_elements", "method_reference"):
-                        obs_data[key] = value
+                obs_data = formatted_by_id.get(obs["id"])
+                if obs_data is None:
+                    obs_data = _format_observation_for_llm(obs)
                 formatted_obs.append(obs_data)
 
             grouped.append({
@@ -382,7 +530,86 @@ def _format_observations_for_llm(
     if general_obs:
         result["observations_from_general_literature"] = group_by_method(general_obs)
 
-    return json.dumps(result, indent=2)
+    return orjson.dumps(result).decode()
+
+
+class _ObservationCandidates:
+    """
+    Candidate bookkeeping and formatting for one c2o run, shared across claims.
+
+    Observations get dense integer indices (their position in the list), so
+    a claim's candidate set is a boolean mask filled from similar-observation
+    indices and precomputed per-paper index arrays instead of a set of string
+    ids. Each observation's LLM dict is built once, and the JSON for a given
+    (candidate set, claim paper) pair is serialized once and reused by every
+    claim or group that ends up with the same candidates.
+    """
+
+    def __init__(
+        self,
+        observations: list[dict],
+        methods_lookup: dict[str, dict],
+        observations_by_paper: dict[str, list[dict]],
+    ):
+        self.observations = observations
+        self.methods_lookup = methods_lookup
+
+        index_by_id = {obs["id"]: i for i, obs in enumerate(observations)}
+        self.indices_by_paper = {
+            paper_id: np.array([index_by_id[o["id"]] for o in obs_list], dtype=np.intp)
+            for paper_id, obs_list in observations_by_paper.items()
+        }
+
+        self._formatted_by_id = {obs["id"]: _format_observation_for_llm(obs) for obs in observations}
+        self._json_cache: dict[tuple[bytes, str | None], str] = {}
+
+    def new_mask(self) -> np.ndarray:
+        """Empty candidate mask (one flag per observation)."""
+        return np.zeros(len(self.observations), dtype=bool)
+
+    def build_mask(
+        self,
+        claim_paper_id: str | None,
+        similar_indices: Iterable[np.ndarray] = (),
+    ) -> np.ndarray:
+        """
+        Build the candidate mask for a claim or a group of same-paper claims.
+
+        Args:
+            claim_paper_id: Paper of the claim(s); its observations are always candidates
+            similar_indices: Arrays of similar observation indices (one per claim)
+
+        Returns:
+            Boolean mask over observations
+        """
+        mask = self.new_mask()
+        for indices in similar_indices:
+            mask[indices] = True
+        self.add_paper(mask, claim_paper_id)
+        return mask
+
+    def add_paper(self, mask: np.ndarray, paper_id: str | None) -> None:
+        """Mark all observations from a paper as candidates."""
+        indices = self.indices_by_paper.get(paper_id) if paper_id else None
+        if indices is not None:
+            mask[indices] = True
+
+    def format(self, mask: np.ndarray, claim_paper_id: str | None) -> str:
+        """Get the observations JSON for a candidate mask (cached per candidate set and paper)."""
+        # flatnonzero is sorted, which also keeps the prompt stable across runs
+        indices = np.flatnonzero(mask)
+        key = (indices.tobytes(), claim_paper_id)
+        observations_json = self._json_cache.get(key)
+        if observations_json is None:
+            candidates = [self.observations[i] for i in indices.tolist()]
+            observations_json = _format_observations_for_llm(
+                candidates,
+                self.methods_lookup,
+                claim_paper_id=claim_paper_id,
+                formatted_by_id=self._formatted_by_id,
+            )
+            self._json_cache[key] = observations_json
+        return observations_json
 
 
 def _deduplicate_links(links: list[EvidenceLink]) -> list[EvidenceLink]:
@@ -390,22 +617,23 @@ def _deduplicate_links(links: list[EvidenceLink]) -> list[EvidenceLink]:
     Remove duplicate evidence links.
 
     Since evidence links are directional (claim -> observation), we use
-    the full tuple as the key.
+    the full tuple as the key. The first link per key wins, in input order.
     """
-    seen = set()
-    unique = []
-
+    # One dict replaces the seen-set + list pair; dicts preserve insertion order
+    unique: dict[tuple[str, str, str], EvidenceLink] = {}
     for link in links:
-        key = (link.claim_id, link.observation_id, link.link_type)
-        if key not in seen:
-            seen.add(key)
-            unique.append(link)
+        unique.setdefault((link.claim_id, link.observation_id, link.link_type.value), link)
 
-    return unique
+    return list(unique.values())
 
 
 # --- Claim-Level Linking ---
 
+# Shared linker for link_observations_to_claim. Predict keeps no per-call
+# state, so one instance can serve every call; build a separate instance
+# if you need different demos or settings per call.
+_DEFAULT_LINKER = EvidenceLinker()
+
 
 def link_observations_to_claim(
     claim: dict,
@@ -448,7 +676,7 @@ def link_observations_to_claim(
         return []
 
     # 2. Run evidence linker
-    linker = EvidenceLinker()
+    linker = _DEFAULT_LINKER
     claim_json = _format_claim_for_llm(claim)
     observations_json = _format_observations_for_llm(
         candidate_observations, methods_lookup, claim_paper_id=claim.get("paper_id")
@@ -470,73 +698,63 @@ MAX_CONCURRENT_REQUESTS = 50
 # Default batch size for saving links
 DEFAULT_BATCH_SIZE = 20
 
+# Max claims from the same paper linked in one LLM call (they share one observations prompt)
+CLAIMS_PER_CALL = 5
+
+
+def _group_claims_by_paper(claims: list[dict], group_size: int) -> list[list[tuple[int, dict]]]:
+    """
+    Split claims into groups of up to group_size claims from the same paper.
+
+    Each claim is paired with its index in the input list (used for logging).
+    """
+    by_paper: dict[str | None, list[tuple[int, dict]]] = {}
+    for idx, claim in enumerate(claims):
+        by_paper.setdefault(claim.get("paper_id"), []).append((idx, claim))
+
+    groups = []
+    for paper_claims in by_paper.values():
+        for start in range(0, len(paper_claims), group_size):
+            groups.append(paper_claims[start : start + group_size])
+    return groups
+
 
 async def _process_claim_async(
     semaphore: asyncio.Semaphore,
     linker: EvidenceLinker,
     claim: dict,
-    observations: list[dict],
-    methods: list[dict],
-    methods_lookup: dict[str, dict],
-    observations_by_method: dict[str, list[dict]],
-    observations_by_paper: dict[str, list[dict]],
+    candidates: _ObservationCandidates,
     claim_idx: int,
+    similar_obs_indices: dict[str, np.ndarray],
 ) -> list[EvidenceLink]:
     """
     Process a single claim with semaphore-controlled concurrency.
 
-    Performs method selection and evidence linking for one claim.
-    All sync operations are run in executor to avoid blocking.
+    Collects the claim's candidate observations (its similar observations from
+    similar_obs_indices plus its paper's own) and runs evidence linking. The
+    LLM call uses DSPy's native async path, so concurrency is bounded by the
+    semaphore rather than the default thread pool.
     """
-    from services.link.method_selector import select_methods_for_claims
-
     async with semaphore:
-        loop = asyncio.get_event_loop()
-
-        # 1. Method selection for this claim (sync, run in executor)
-        candidate_obs_ids: set[str] = set()
-
-        if methods:
-            try:
-                method_selections = await loop.run_in_executor(
-                    None, select_methods_for_claims, [claim], methods
-                )
-                selected_method_ids = method_selections[0] if method_selections else []
-
-                # Add observations from selected methods
-                for method_id in selected_method_ids:
-                    for obs in observations_by_method.get(method_id, []):
-                        candidate_obs_ids.add(obs["id"])
-            except Exception as e:
-                logger.error(f"Error selecting methods for claim {claim_idx + 1}: {e}")
-
-        # Always include same-paper observations
+        # 1. Candidate observations for this claim
         claim_paper_id = claim.get("paper_id")
-        if claim_paper_id:
-            for obs in observations_by_paper.get(claim_paper_id, []):
-                candidate_obs_ids.add(obs["id"])
+        similar = [similar_obs_indices[claim["id"]]] if claim["id"] in similar_obs_indices else []
 
-        # 2. Build candidate observations list
-        if candidate_obs_ids:
-            candidate_observations = [obs for obs in observations if obs["id"] in candidate_obs_ids]
-        else:
-            candidate_observations = []
+        # Same-paper observations are always included
+        candidate_mask = candidates.build_mask(claim_paper_id, similar)
 
-        if not candidate_observations:
+        n_candidates = int(candidate_mask.sum())
+        if not n_candidates:
             return []
 
-        logger.info(f"Processing claim {claim_idx + 1} ({len(candidate_observations)} observations)")
+        logger.info(f"Processing claim {claim_idx + 1} ({n_candidates} observations)")
 
-        # 3. Evidence linking (sync DSPy call, run in executor)
+        # 2. Evidence linking
         claim_json = _format_claim_for_llm(claim)
-        observations_json = _format_observations_for_llm(
-            candidate_observations, methods_lookup, claim_paper_id=claim_paper_id
-        )
+        observations_json = candidates.format(candidate_mask, claim_paper_id)
 
         try:
-            links = await loop.run_in_executor(
-                None, linker, claim_json, observations_json
-            )
+            links = await linker.acall(claim_json, observations_json)
             logger.info(f"Found {len(links)} evidence links for claim {claim_idx + 1}")
             return links
         except Exception as e:
@@ -544,10 +762,73 @@ async def _process_claim_async(
             return []
 
 
-def _aggregate_usage_from_history() -> UsageStats:
-    """Aggregate usage stats from all LM history entries."""
+async def _process_claim_group_async(
+    semaphore: asyncio.Semaphore,
+    linker: EvidenceLinker,
+    group_linker: GroupEvidenceLinker,
+    group: list[tuple[int, dict]],
+    candidates: _ObservationCandidates,
+    similar_obs_indices: dict[str, np.ndarray],
+) -> list[EvidenceLink]:
+    """
+    Process a group of same-paper claims with one linking call.
+
+    The claims share their candidate observations (each claim's similar
+    observations plus their paper's own observations), so the observations
+    prompt is sent once per group instead of once per claim. Single-claim
+    groups go through _process_claim_async.
+    """
+    if len(group) == 1:
+        claim_idx, claim = group[0]
+        return await _process_claim_async(
+            semaphore,
+            linker,
+            claim,
+            candidates,
+            claim_idx,
+            similar_obs_indices,
+        )
+
+    group_claims = [claim for _, claim in group]
+    first_idx = group[0][0]
+    claim_paper_id = group_claims[0].get("paper_id")
+
+    async with semaphore:
+        # 1. Candidate observations for the whole group
+        similar = [similar_obs_indices[c["id"]] for c in group_claims if c["id"] in similar_obs_indices]
+
+        # Same-paper observations are always included
+        candidate_mask = candidates.build_mask(claim_paper_id, similar)
+
+        n_candidates = int(candidate_mask.sum())
+        if not n_candidates:
+            return []
+
+        logger.info(
+            f"Processing {len(group_claims)} claims from claim {first_idx + 1} "
+            f"({n_candidates} observations)"
+        )
+
+        # 2. Evidence linking for the whole group
+        claims_json = _format_claims_for_llm(group_claims)
+        observations_json = candidates.format(candidate_mask, claim_paper_id)
+
+        try:
+            links = await group_linker.acall(claims_json, observations_json)
+        except Exception as e:
+            logger.error(f"Error processing claims {first_idx + 1}-{group[-1][0] + 1}: {e}")
+            return []
+
+    # Drop links to claims that are not part of this group
+    group_claim_ids = {claim["id"] for claim in group_claims}
+    links = [link for link in links if link.claim_id in group_claim_ids]
+    logger.info(f"Found {len(links)} evidence links for {len(group_claims)} claims from claim {first_idx + 1}")
+    return links
+
+
+def _aggregate_usage_from_history(lm: dspy.LM | None) -> UsageStats:
+    """Aggregate usage stats from all history entries of the given LM."""
     stats = UsageStats()
-    lm = dspy.settings.lm
     if lm and lm.history:
         for entry in lm.history:
             usage = entry.get("usage", {})
@@ -559,7 +840,6 @@ def _aggregate_usage_from_history() -> UsageStats:
 async def _link_claims_async(
     claims: list[dict],
     observations: list[dict],
-    methods: list[dict],
     methods_lookup: dict[str, dict],
     max_concurrent: int = MAX_CONCURRENT_REQUESTS,
     job_id: str | None = None,
@@ -567,18 +847,21 @@ async def _link_claims_async(
     valid_observation_ids: set[str] | None = None,
     batch_size: int = DEFAULT_BATCH_SIZE,
     progress_callback: Callable[[list[str]], None] | None = None,
+    claims_per_call: int = CLAIMS_PER_CALL,
+    observations_by_paper: dict[str, list[dict]] | None = None,
 ) -> tuple[list[EvidenceLink], UsageStats, int]:
     """
     Run evidence linking on multiple claims concurrently.
 
-    Each claim task handles its own method selection and linking sequentially,
-    avoiding nested event loop issues. Saves links to database per-batch for
-    partial progress persistence.
+    Candidate observations are preselected per batch by embedding similarity
+    (top OBSERVATIONS_PER_CLAIM per claim, plus same-paper observations).
+    Within each batch, claims are grouped by paper (up to claims_per_call per
+    group) and each group is linked in one LLM call. Saves links to database
+    per-batch for partial progress persistence.
 
     Args:
         claims: List of claim dicts to process
         observations: All observations in the library
-        methods: All methods in the library
         methods_lookup: Dict mapping method_id -> method dict
         max_concurrent: Maximum concurrent LLM requests
         job_id: Job ID for saving links
@@ -586,87 +869,138 @@ async def _link_claims_async(
         valid_observation_ids: Set of valid observation IDs for validation
         batch_size: Number of claims per batch
         progress_callback: Optional callback(processed_claim_ids) called after each batch
+        claims_per_call: Max same-paper claims linked per LLM call (1 = one call per claim)
+        observations_by_paper: Prebuilt lookup (built from observations if omitted)
 
     Returns:
         Tuple of (links, usage_stats, total_saved)
     """
-    from services.link.db_utils import save_c2o_links
-
-    # Build observation lookups (shared across all tasks)
-    observations_by_method, observations_by_paper = _build_observation_lookups(observations)
-
-    # Clear history before run so we only capture this batch
+    # Observation lookups (shared across all tasks)
+    if observations_by_paper is None:
+        _, observations_by_paper = _build_observation_lookups(observations)
+    candidates = _ObservationCandidates(observations, methods_lookup, observations_by_paper)
+    observation_matrix = _normalized_embedding_matrix(observations)
+
+    # Run on a private copy of the configured LM: its history holds exactly
+    # this run's calls, so a concurrent run (e.g. c2c in the link job) never
+    # clears or reads these entries in the shared global LM
     lm = dspy.settings.lm
-    if lm:
-        lm.history.clear()
+    run_lm = lm.copy() if lm else None
 
     # Run evidence linking concurrently
     semaphore = asyncio.Semaphore(max_concurrent)
     linker = EvidenceLinker()
+    group_linker = GroupEvidenceLinker()
+    claims_per_call = max(1, claims_per_call)
 
     all_links: list[EvidenceLink] = []
     total_saved = 0
 
-    # Process claims in batches
-    for batch_start in range(0, len(claims), batch_size):
-        batch_end = min(batch_start + batch_size, len(claims))
-        batch_claims = claims[batch_start:batch_end]
-
-        logger.info(f"Processing c2o batch {batch_start // batch_size + 1} (claims {batch_start + 1}-{batch_end})")
-
-        tasks = [
-            _process_claim_async(
-                semaphore,
-                linker,
-                claim,
-                observations,
-                methods,
-                methods_lookup,
-                observations_by_method,
-                observations_by_paper,
-                batch_start + i,
-            )
-            for i, claim in enumerate(batch_claims)
-        ]
+    with dspy.context(lm=run_lm):
+        # Process claims in batches
+        for batch_start in range(0, len(claims), batch_size):
+            batch_end = min(batch_start + batch_size, len(claims))
+            batch_claims = claims[batch_start:batch_end]
+
+            logger.info(f"Processing c2o batch {batch_start // batch_size + 1} (claims {batch_start + 1}-{batch_end})")
+
+            similar_obs_indices = _similar_observation_indices(batch_claims, observation_matrix)
+
+            groups = _group_claims_by_paper(batch_claims, claims_per_call)
+            tasks = [
+                _process_claim_group_async(
+                    semaphore,
+                    linker,
+                    group_linker,
+                    [(batch_start + i, claim) for i, claim in group],
+                    candidates,
+                    similar_obs_indices,
+                )
+                for group in groups
+            ]
 
-        results = await asyncio.gather(*tasks)
+            results = await asyncio.gather(*tasks)
 
-        # Flatten batch results
-        batch_links: list[EvidenceLink] = []
-        for links in results:
-            batch_links.extend(links)
+            # Flatten batch results
+            batch_links: list[EvidenceLink] = []
+            for links in results:
+                batch_links.extend(links)
 
-        # Deduplicate within batch
-        batch_unique = _deduplicate_links(batch_links)
-        all_links.extend(batch_unique)
+            # Deduplicate within batch
+            batch_unique = _deduplicate_links(batch_links)
+            all_links.extend(batch_unique)
 
-        # Save batch to database (upsert handles cross-batch duplicates)
-        if batch_unique and job_id is not None:
-            saved = save_c2o_links(batch_unique, job_id, valid_claim_ids, valid_observation_ids)
-            total_saved += saved
-            logger.info(f"Saved {saved} c2o links from batch {batch_start // batch_size + 1}")
+            # Save batch to database (upsert handles cross-batch duplicates), off the
+            # event loop so a concurrent linker's LLM calls keep going meanwhile
+            if batch_unique and job_id is not None:
+                saved = await asyncio.to_thread(
+                    save_c2o_links, batch_unique, job_id, valid_claim_ids, valid_observation_ids
+                )
+                total_saved += saved
+                logger.info(f"Saved {saved} c2o links from batch {batch_start // batch_size + 1}")
 
-        # Report progress - claim IDs from this batch
-        if progress_callback:
-            batch_claim_ids = [c["id"] for c in batch_claims]
-            progress_callback(batch_claim_ids)
+            # Report progress - claim IDs from this batch
+            if progress_callback:
+                batch_claim_ids = [c["id"] for c in batch_claims]
+                progress_callback(batch_claim_ids)
 
-    # Aggregate usage from all history entries after completion
-    stats = _aggregate_usage_from_history()
+    # Aggregate usage from this run's calls only
+    stats = _aggregate_usage_from_history(run_lm)
 
     return all_links, stats, total_saved
 
 
-def link_observations_to_input_claims(
+def _fetch_linking_inputs(
+    library_id: str,
+    input_claims: list[dict],
+    observations: list[dict] | None,
+    observations_by_paper: dict[str, list[dict]] | None,
+    methods: list[dict] | None,
+) -> tuple[list[dict], dict[str, list[dict]] | None, list[dict]]:
+    """
+    Fetch what c2o linking needs from the DB, skipping what the caller passed in.
+
+    ALL observations (with lookups, cached per library), the methods for
+    observation context and the claims' paper titles are fetched concurrently -
+    they are independent DB round trips.
+
+    Returns:
+        Tuple of (observations, observations_by_paper, methods)
+    """
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        observations_future = (
+            executor.submit(_get_library_observations, library_id)
+            if observations is None else None
+        )
+        methods_future = executor.submit(_fetch_methods, library_id) if methods is None else None
+        titles_future = executor.submit(add_paper_titles_to_claims, input_claims)
+
+        if observations_future is not None:
+            observations, _, observations_by_paper = observations_future.result()
+        if methods_future is not None:
+            methods = methods_future.result()
+        titles_future.result()
+
+    return observations, observations_by_paper, methods
+
+
+async def link_observations_to_input_claims_async(
     library_id: str | UUID,
     input_claims: list[dict],
     job_id: str | None = None,
     valid_claim_ids: set[str] | None = None,
     valid_observation_ids: set[str] | None = None,
     progress_callback: Callable[[list[str]], None] | None = None,
+    observations: list[dict] | None = None,
+    observations_by_paper: dict[str, list[dict]] | None = None,
+    methods: list[dict] | None = None,
 ) -> C2OLinkingResult:
     """
-    Link input claims against ALL observations in a library.
+    Link input claims against ALL observations in a library (async).
+
+    Coroutine version of link_observations_to_input_claims, for callers that
+    already drive an event loop. Its blocking DB work runs in worker threads,
+    so it can share a loop with other linkers.
 
     Used by LINK_LIBRARY job for incremental linking - only processes
     new/unlinked claims rather than the entire library.
@@ -679,7 +1013,13 @@ def link_observations_to_input_claims(
         input_claims: List of claim dicts (must include embeddings)
         job_id: Optional job ID for associating saved links (enables per-batch saving)
         valid_claim_ids: Optional set of valid claim IDs for validation
+            (defaults to the IDs of the input claims)
         valid_observation_ids: Optional set of valid observation IDs for validation
+            (defaults to the IDs of the library's observations)
+        observations: Library observations the caller already fetched with
+            _get_library_observations (skips the fetch and its version check)
+        observations_by_paper: Paper lookup returned alongside observations
+        methods: Library methods the caller already fetched with _fetch_methods
 
     Returns:
         C2OLinkingResult with discovered evidence links, usage stats, and save count
@@ -703,8 +1043,17 @@ def link_observations_to_input_claims(
             links_saved=0,
         )
 
-    # Fetch ALL observations from the library
-    observations = _fetch_observations_with_embeddings(library_id_str)
+    # Fetch ALL observations, the methods and the claims' paper titles in a worker
+    # thread, so the event loop stays free for a concurrent linker
+    observations, observations_by_paper, methods = await asyncio.to_thread(
+        _fetch_linking_inputs,
+        library_id_str,
+        input_claims,
+        observations,
+        observations_by_paper,
+        methods,
+    )
+
     logger.info(f"Fetched {len(observations)} observations with embeddings")
 
     if not observations:
@@ -721,32 +1070,28 @@ def link_observations_to_input_claims(
             links_saved=0,
         )
 
-    # Fetch methods for preselection
-    methods = _fetch_methods(library_id_str)
-    logger.info(f"Fetched {len(methods)} methods for preselection")
-
-    # Add paper titles to claims for LLM context
-    add_paper_titles_to_claims(input_claims)
+    logger.info(f"Fetched {len(methods)} methods for observation context")
 
     # Build methods lookup for observation context
     methods_lookup = {m["id"]: m for m in methods}
 
-    # Build valid_observation_ids if not provided
+    # Build valid ID sets if not provided - links can only involve the input
+    # claims and the observations fetched above
+    if valid_claim_ids is None:
+        valid_claim_ids = {c["id"] for c in input_claims}
     if valid_observation_ids is None:
         valid_observation_ids = {o["id"] for o in observations}
 
     # Run linking on input claims concurrently (saves per-batch if job_id provided)
-    all_links, stats, total_saved = asyncio.run(
-        _link_claims_async(
-            input_claims,
-            observations,
-            methods,
-            methods_lookup,
-            job_id=job_id,
-            valid_claim_ids=valid_claim_ids,
-            valid_observation_ids=valid_observation_ids,
-            progress_callback=progress_callback,
-        )
+    all_links, stats, total_saved = await _link_claims_async(
+        input_claims,
+        observations,
+        methods_lookup,
+        job_id=job_id,
+        valid_claim_ids=valid_claim_ids,
+        valid_observation_ids=valid_observation_ids,
+        progress_callback=progress_callback,
+        observations_by_paper=observations_by_paper,
     )
 
     # Deduplicate links (for return value - DB already handles duplicates)
@@ -768,6 +1113,38 @@ def link_observations_to_input_claims(
     )
 
 
+def link_observations_to_input_claims(
+    library_id: str | UUID,
+    input_claims: list[dict],
+    job_id: str | None = None,
+    valid_claim_ids: set[str] | None = None,
+    valid_observation_ids: set[str] | None = None,
+    progress_callback: Callable[[list[str]], None] | None = None,
+    observations: list[dict] | None = None,
+    observations_by_paper: dict[str, list[dict]] | None = None,
+    methods: list[dict] | None = None,
+) -> C2OLinkingResult:
+    """
+    Link input claims against ALL observations in a library.
+
+    Synchronous wrapper around link_observations_to_input_claims_async; see it
+    for the arguments.
+    """
+    return run_async(
+        link_observations_to_input_claims_async(
+            library_id,
+            input_claims,
+            job_id=job_id,
+            valid_claim_ids=valid_claim_ids,
+            valid_observation_ids=valid_observation_ids,
+            progress_callback=progress_callback,
+            observations=observations,
+            observations_by_paper=observations_by_paper,
+            methods=methods,
+        )
+    )
+
+
 def link_observations_to_claims(
     library_id: str | UUID,
     job_id: str | None = None,
@@ -780,9 +1157,9 @@ def link_observations_to_claims(
 
     Steps:
     1. Fetch all claim extracts with embeddings
-    2. Fetch all observation extracts with embeddings
-    3. Fetch all methods for method-based preselection
-    4. Batch method selection for all claims
+    2. Fetch all observation extracts with embeddings (concurrently with 1)
+    3. Fetch all methods for observation context (concurrently with 1)
+    4. Preselect candidate observations per claim by embedding similarity
     5. Run DSPy linker on each claim (concurrently), saving per-batch
     6. Deduplicate and return results
 
@@ -796,12 +1173,17 @@ def link_observations_to_claims(
     library_id_str = str(library_id)
     logger.info(f"Starting claim-to-observation linking for library_id={library_id_str}")
 
-    # 1. Fetch claims with embeddings
-    claims = _fetch_claims_with_embeddings(library_id_str)
-    logger.info(f"Fetched {len(claims)} claims with embeddings")
+    # 1-3. Fetch claims, observations and methods concurrently. They are passed
+    # to the delegated call below, which then only adds the paper titles
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        claims_future = executor.submit(_fetch_claims_with_embeddings, library_id_str)
+        observations_future = executor.submit(_get_library_observations, library_id_str)
+        methods_future = executor.submit(_fetch_methods, library_id_str)
+        claims = claims_future.result()
+        observations, _, observations_by_paper = observations_future.result()
+        methods = methods_future.result()
 
-    # 2. Fetch observations with embeddings
-    observations = _fetch_observations_with_embeddings(library_id_str)
+    logger.info(f"Fetched {len(claims)} claims with embeddings")
     logger.info(f"Fetched {len(observations)} observations with embeddings")
 
     if not claims or not observations:
@@ -829,6 +1211,9 @@ def link_observations_to_claims(
         job_id=job_id,
         valid_claim_ids=valid_claim_ids,
         valid_observation_ids=valid_observation_ids,
+        observations=observations,
+        observations_by_paper=observations_by_paper,
+        methods=methods,
     )
 
 
@@ -860,7 +1245,7 @@ def handle_link_evidence(payload: dict[str, Any]) -> dict[str, Any]:
         "groups_processed": result.groups_processed,
         "links_count": len(result.links),
         "links_saved": c2o_result.links_saved,
-        "links": [link.model_dump() for link in result.links],
+        "links": _LINKS_ADAPTER.dump_python(result.links),
         "usage": {
             "total_calls": stats.total_calls,
             "input_tokens": stats.total_input_tokens,
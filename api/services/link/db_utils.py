@@ -1,21 +1,37 @@
 """Shared utilities for data validation and transformation before saving to database."""
 import logging
 import re
+from functools import lru_cache
+
+from pydantic import TypeAdapter
 
 from db.queries.extract_links import ExtractLinkQueries
+from services.link.claim2claim import ClaimLink
 
 logger = logging.getLogger(__name__)
 
-# UUID validation regex
+# Dumps a whole batch of c2c links in one pydantic-core call (JSON mode serializes the enum)
+_CLAIM_LINKS_ADAPTER = TypeAdapter(list[ClaimLink])
+
+# UUID validation regex (explicit A-F instead of IGNORECASE, which folds case per char)
 UUID_PATTERN = re.compile(
-    r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$',
-    re.IGNORECASE
+    r'[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}'
 )
 
+# Bound once - is_valid_uuid runs twice per link in the save loops
+_match_uuid = UUID_PATTERN.fullmatch
+
 
 def is_valid_uuid(value: str) -> bool:
     """Check if a string is a valid UUID format."""
-    return bool(UUID_PATTERN.match(value))
+    # Length check rejects most malformed IDs before the regex runs
+    return len(value) == 36 and _match_uuid(value) is not None
+
+
+@lru_cache(maxsize=1)
+def _get_extract_links() -> ExtractLinkQueries:
+    """Shared ExtractLinkQueries for the save helpers (it only wraps the cached Supabase client)."""
+    return ExtractLinkQueries()
 
 
 def save_c2c_links(
@@ -39,47 +55,65 @@ def save_c2c_links(
     if not links:
         return 0
 
-    extract_links = ExtractLinkQueries()
+    extract_links = _get_extract_links()
 
-    # Convert ClaimLink objects to dicts, validating UUIDs and IDs
-    link_records = []
-    skipped = 0
+    # Filter out links with invalid/non-existent IDs and repeated (from_id, to_id) pairs
+    valid_links = []
+    append_link = valid_links.append
+    seen: set[tuple[str, str]] = set()
+    invalid_format = 0
+    nonexistent = 0
+    duplicates = 0
     for link in links:
         from_id = link.claim_id_1
         to_id = link.claim_id_2
 
-        # Validate UUID format
-        if not is_valid_uuid(from_id) or not is_valid_uuid(to_id):
-            logger.warning(f"Skipping c2c link with invalid UUID format: from={from_id}, to={to_id}")
-            skipped += 1
+        # The first link per pair wins, as it would in the upsert. Pairs stay
+        # ordered: premise links are directional
+        key = (from_id, to_id)
+        if key in seen:
+            duplicates += 1
             continue
+        seen.add(key)
 
-        # Validate IDs exist in valid set
+        # Validate IDs exist in valid set (built from DB rows, so this also proves UUID format)
         if valid_claim_ids is not None:
             if from_id not in valid_claim_ids or to_id not in valid_claim_ids:
-                logger.warning(f"Skipping c2c link with non-existent ID: from={from_id}, to={to_id}")
-                skipped += 1
+                logger.debug("Skipping c2c link with non-existent ID: from=%s, to=%s", from_id, to_id)
+                nonexistent += 1
                 continue
 
-        # Dump full LLM response and add metadata
-        content = link.model_dump()
-        content["link_type"] = link.link_type.value  # Ensure enum is serialized as string
-        content["link_category"] = "claim_to_claim"
+        # Otherwise validate UUID format
+        elif not is_valid_uuid(from_id) or not is_valid_uuid(to_id):
+            logger.debug("Skipping c2c link with invalid UUID format: from=%s, to=%s", from_id, to_id)
+            invalid_format += 1
+            continue
 
-        link_records.append({
-            "from_id": from_id,
-            "to_id": to_id,
-            "content": content,
-        })
+        append_link(link)
 
-    if skipped > 0:
-        logger.warning(f"Skipped {skipped} c2c links with invalid/non-existent IDs")
+    # Per-link details are logged at debug level; one summary line per batch
+    if invalid_format or nonexistent:
+        logger.warning(
+            f"Skipped {invalid_format + nonexistent} c2c links: "
+            f"{invalid_format} invalid UUID format, {nonexistent} non-existent ID"
+        )
+    if duplicates > 0:
+        logger.info(f"Dropped {duplicates} duplicate c2c links")
 
-    if not link_records:
+    if not valid_links:
         return 0
 
-    saved = extract_links.create_many(link_records, job_id=job_id)
-    return len(saved)
+    # Dump full LLM responses in one batch and add metadata
+    contents = _CLAIM_LINKS_ADAPTER.dump_python(valid_links, mode="json")
+    for content in contents:
+        content["link_category"] = "claim_to_claim"
+
+    # Records are generated as bulk_insert consumes them (no intermediate list)
+    link_records = (
+        (link.claim_id_1, link.claim_id_2, content)
+        for link, content in zip(valid_links, contents)
+    )
+    return extract_links.bulk_insert(link_records, job_id=job_id)
 
 
 def save_c2o_links(
@@ -105,48 +139,73 @@ def save_c2o_links(
     if not links:
         return 0
 
-    extract_links = ExtractLinkQueries()
+    extract_links = _get_extract_links()
 
-    # Convert EvidenceLink objects to dicts, validating UUIDs and IDs
-    link_records = []
-    skipped = 0
+    # Filter out links with invalid/non-existent IDs and repeated (from_id, to_id) pairs
+    valid_links = []
+    append_link = valid_links.append
+    seen: set[tuple[str, str]] = set()
+    invalid_format = 0
+    nonexistent = 0
+    duplicates = 0
     for link in links:
         from_id = link.claim_id
         to_id = link.observation_id
 
-        # Validate UUID format
-        if not is_valid_uuid(from_id) or not is_valid_uuid(to_id):
-            logger.warning(f"Skipping c2o link with invalid UUID format: from={from_id}, to={to_id}")
-            skipped += 1
+        # The first link per pair wins, as it would in the upsert
+        key = (from_id, to_id)
+        if key in seen:
+            duplicates += 1
+            continue
+        seen.add(key)
+
+        # Validate UUID format, only for IDs without a valid set (the sets are
+        # built from DB rows, so membership below also proves the format)
+        if (valid_claim_ids is None and not is_valid_uuid(from_id)) or (
+            valid_observation_ids is None and not is_valid_uuid(to_id)
+        ):
+            logger.debug("Skipping c2o link with invalid UUID format: from=%s, to=%s", from_id, to_id)
+            invalid_format += 1
             continue
 
         # Validate claim ID exists
         if valid_claim_ids is not None and from_id not in valid_claim_ids:
-            logger.warning(f"Skipping c2o link with non-existent claim ID: {from_id}")
-            skipped += 1
+            logger.debug("Skipping c2o link with non-existent claim ID: %s", from_id)
+            nonexistent += 1
             continue
 
         # Validate observation ID exists
         if valid_observation_ids is not None and to_id not in valid_observation_ids:
-            logger.warning(f"Skipping c2o link with non-existent observation ID: {to_id}")
-            skipped += 1
+            logger.debug("Skipping c2o link with non-existent observation ID: %s", to_id)
+            nonexistent += 1
             continue
 
-        link_records.append({
-            "from_id": from_id,
-            "to_id": to_id,
-            "content": {
+        append_link(link)
+
+    # Per-link details are logged at debug level; one summary line per batch
+    if invalid_format or nonexistent:
+        logger.warning(
+            f"Skipped {invalid_format + nonexistent} c2o links: "
+            f"{invalid_format} invalid UUID format, {nonexistent} non-existent ID"
+        )
+    if duplicates > 0:
+        logger.info(f"Dropped {duplicates} duplicate c2o links")
+
+    if not valid_links:
+        return 0
+
+    # Records are generated as bulk_insert consumes them (no intermediate list)
+    link_records = (
+        (
+            link.claim_id,
+            link.observation_id,
+            {
                 "link_type": link.link_type.value,
                 "reasoning": link.reasoning,
                 "link_category": "claim_to_observation",
             },
-        })
-
-    if skipped > 0:
-        logger.warning(f"Skipped {skipped} c2o links with invalid/non-existent IDs")
-
-    if not link_records:
-        return 0
+        )
+        for link in valid_links
+    )
 
-    saved = extract_links.create_many(link_records, job_id=job_id)
-    return len(saved)
+    return extract_links.bulk_insert(link_records, job_id=job_id)
@@ -1,17 +1,33 @@
 """Handler for LINK_LIBRARY jobs."""
+import asyncio
 import logging
+import time
 from datetime import datetime
 from typing import Any
 
 import dspy
 
 from db import ExtractQueries
+from services.async_runner import run_async
 from services.jobs import JobQueue
-from services.link.claim2claim import add_embeddings_to_claims, link_claims
-from services.link.claim2observation import link_observations_to_input_claims
+from services.link.claim2claim import add_embeddings_to_claims, link_claims_async
+from services.link.claim2observation import link_observations_to_input_claims_async
 
 logger = logging.getLogger(__name__)
 
+# Progress is persisted at most this often (seconds) ...
+PROGRESS_SAVE_INTERVAL = 30.0
+
+# ... unless this many claims finished since the last save
+PROGRESS_SAVE_MIN_CLAIMS = 500
+
+
+def _filter_unprocessed(claims: list[dict], processed: set[str]) -> list[dict]:
+    """Drop claims whose id is in processed, keeping input order."""
+    if not processed:
+        return claims
+    return [c for c in claims if c["id"] not in processed]
+
 
 def handle_link_library(payload: dict[str, Any]) -> dict[str, Any]:
     """
@@ -50,13 +66,33 @@ def handle_link_library(payload: dict[str, Any]) -> dict[str, Any]:
     if c2c_processed or c2o_processed:
         logger.info(f"Resuming from progress: {len(c2c_processed)} c2c, {len(c2o_processed)} c2o claims already processed")
 
-    # Progress saving helper
-    def save_progress():
-        if job_id:
-            queue.update_job_progress(job_id, {
-                "c2c_processed": list(c2c_processed),
-                "c2o_processed": list(c2o_processed),
-            })
+    # Progress saving helper (c2c and c2o both report progress from this thread's
+    # event loop). Saves are debounced: each one rewrites the full processed lists,
+    # so saving after every batch would be quadratic in the number of claims
+    last_save_time = time.monotonic()
+    last_save_count = len(c2c_processed) + len(c2o_processed)
+
+    def save_progress(force: bool = False):
+        nonlocal last_save_time, last_save_count
+        if not job_id:
+            return
+
+        count = len(c2c_processed) + len(c2o_processed)
+        if count == last_save_count:
+            return
+        if (
+            not force
+            and time.monotonic() - last_save_time < PROGRESS_SAVE_INTERVAL
+            and count - last_save_count < PROGRESS_SAVE_MIN_CLAIMS
+        ):
+            return
+
+        queue.update_job_progress(job_id, {
+            "c2c_processed": list(c2c_processed),
+            "c2o_processed": list(c2o_processed),
+        })
+        last_save_time = time.monotonic()
+        last_save_count = count
 
     # Configure LM for linking operations
     link_lm = dspy.LM("openai/gpt-5-mini-2025-08-07")
@@ -93,58 +129,59 @@ def handle_link_library(payload: dict[str, Any]) -> dict[str, Any]:
             "message": "No claims with embeddings to link",
         }
 
-    # 2b. Fetch all valid IDs for validation (prevents hallucinated IDs from failing batch)
-    all_claims = extracts.get_claims_by_library(library_id)
-    all_observations = extracts.get_observations_by_library(library_id)
-    valid_claim_ids = {c["id"] for c in all_claims}
-    valid_observation_ids = {o["id"] for o in all_observations}
-    logger.info(f"Loaded {len(valid_claim_ids)} valid claim IDs, {len(valid_observation_ids)} valid observation IDs")
-
-    # 3. Run claim-to-claim linking (saves per-batch internally)
-    # Filter out already-processed claims for c2c
-    c2c_claims = [c for c in claims_with_embeddings if c["id"] not in c2c_processed]
+    # 3. Run claim-to-claim and claim-to-observation linking concurrently
+    # (independent and LLM-bound; each saves per-batch internally and validates
+    # link IDs against the claims/observations it fetched itself)
+    # Filter out already-processed claims for each (only resumed jobs have any).
+    # Input order is kept, since it decides how claims are batched
+    c2c_claims = _filter_unprocessed(claims_with_embeddings, c2c_processed)
+    c2o_claims = _filter_unprocessed(claims_with_embeddings, c2o_processed)
     logger.info(f"Running claim-to-claim linking on {len(c2c_claims)} claims ({len(c2c_processed)} already processed)...")
+    logger.info(f"Running claim-to-observation linking on {len(c2o_claims)} claims ({len(c2o_processed)} already processed)...")
 
     def on_c2c_progress(batch_claim_ids: list[str]):
         c2c_processed.update(batch_claim_ids)
         save_progress()
 
-    c2c_result = link_claims(
-        input_claims=c2c_claims,
-        library_id=library_id,
-        job_id=job_id,
-        valid_claim_ids=valid_claim_ids,
-        progress_callback=on_c2c_progress,
-    )
-    logger.info(f"C2C linking found {len(c2c_result.result.links)} links, saved {c2c_result.links_saved}")
-
-    # 4. Run claim-to-observation linking (saves per-batch internally)
-    # Filter out already-processed claims for c2o
-    c2o_claims = [c for c in claims_with_embeddings if c["id"] not in c2o_processed]
-    logger.info(f"Running claim-to-observation linking on {len(c2o_claims)} claims ({len(c2o_processed)} already processed)...")
-
     def on_c2o_progress(batch_claim_ids: list[str]):
         c2o_processed.update(batch_claim_ids)
         save_progress()
 
-    c2o_result = link_observations_to_input_claims(
-        library_id=library_id,
-        input_claims=c2o_claims,
-        job_id=job_id,
-        valid_claim_ids=valid_claim_ids,
-        valid_observation_ids=valid_observation_ids,
-        progress_callback=on_c2o_progress,
-    )
+    async def run_linkers() -> list:
+        # If one linker fails the other still runs to completion, as its
+        # progress and saved links are still worth keeping
+        return await asyncio.gather(
+            link_claims_async(
+                input_claims=c2c_claims,
+                library_id=library_id,
+                job_id=job_id,
+                progress_callback=on_c2c_progress,
+            ),
+            link_observations_to_input_claims_async(
+                library_id=library_id,
+                input_claims=c2o_claims,
+                job_id=job_id,
+                progress_callback=on_c2o_progress,
+            ),
+            return_exceptions=True,
+        )
+
+    # Both linkers run as tasks on this process's long-lived event loop.
+    # The final flush runs even if a linker fails, so a retry resumes from here
+    try:
+        c2c_result, c2o_result = run_async(run_linkers())
+        for result in (c2c_result, c2o_result):
+            if isinstance(result, BaseException):
+                raise result
+    finally:
+        save_progress(force=True)
+
+    logger.info(f"C2C linking found {len(c2c_result.result.links)} links, saved {c2c_result.links_saved}")
     logger.info(f"C2O linking found {len(c2o_result.result.links)} links, saved {c2o_result.links_saved}")
 
-    # Log which model was used (from last history entry)
-    model_used = None
-    if link_lm.history:
-        last_entry = link_lm.history[-1]
-        model_used = last_entry.get("model")
-        logger.info(f"Link library job complete using model={model_used}")
-    else:
-        logger.info("Link library job complete")
+    # The linkers record calls on private copies of link_lm, so take the model from it directly
+    model_used = link_lm.model
+    logger.info(f"Link library job complete using model={model_used}")
 
     return {
         "library_id": library_id,
@@ -1,8 +1,12 @@
 """Select relevant methods for a claim using DSPy."""
 import asyncio
 import logging
+from collections import OrderedDict
 
 import dspy
+import orjson
+
+from services.async_runner import run_async
 
 logger = logging.getLogger(__name__)
 
@@ -30,8 +34,10 @@ class SelectRelevantMethods(dspy.Signature):
     method than to miss one that could provide key evidence.
     """
 
-    claim_json: str = dspy.InputField(desc="JSON object with claim id and text")
+    # Methods first: the catalog is identical across calls for a library, so
+    # it forms a shared prompt prefix that provider prompt caching can reuse
     methods_json: str = dspy.InputField(desc="JSON array of methods with id and summary")
+    claim_json: str = dspy.InputField(desc="JSON object with claim id and text")
     selection: list[str] = dspy.OutputField(desc="UUIDs of the methods likely to have produced relevant evidence")
 
 
@@ -47,7 +53,12 @@ class MethodSelector(dspy.Module):
 
     def forward(self, claim_json: str, methods_json: str) -> list[str]:
         """Select methods relevant to a claim."""
-        result = self.select(claim_json=claim_json, methods_json=methods_json)
+        result = self.select(methods_json=methods_json, claim_json=claim_json)
+        return result.selection
+
+    async def aforward(self, claim_json: str, methods_json: str) -> list[str]:
+        """Select methods relevant to a claim without blocking the event loop."""
+        result = await self.select.acall(methods_json=methods_json, claim_json=claim_json)
         return result.selection
 
 
@@ -56,21 +67,17 @@ class MethodSelector(dspy.Module):
 
 def _format_claim_for_llm(claim: dict) -> str:
     """Format a single claim as JSON for the DSPy module."""
-    import json
-
     formatted = {
         "id": claim["id"],
         "paper_id": claim["paper_id"],
         "paper_title": claim.get("paper_title", ""),
         "claim": claim["content"].get("rephrased_claim", ""),
     }
-    return json.dumps(formatted, indent=2)
+    return orjson.dumps(formatted).decode()
 
 
 def _format_methods_for_llm(methods: list[dict]) -> str:
-    """Format methods as JSON for the DSPy module."""
-    import json
-
+    """Format methods as compact JSON for the DSPy module (indentation only costs prompt tokens)."""
     formatted = []
     for method in methods:
         formatted.append({
@@ -78,32 +85,58 @@ def _format_methods_for_llm(methods: list[dict]) -> str:
             "paper_id": method["paper_id"],
             "summary": method["content"].get("method_summary", ""),
         })
-    return json.dumps(formatted, indent=2)
+    return orjson.dumps(formatted).decode()
+
+
+# Max method catalogs kept formatted (one per library being linked)
+METHODS_JSON_CACHE_SIZE = 8
+
+# Tuple of method ids -> formatted catalog (method extracts are immutable once saved)
+_methods_json_cache: OrderedDict[tuple[str, ...], str] = OrderedDict()
+
+
+def _get_methods_json(methods: list[dict]) -> str:
+    """
+    Get the method catalog JSON, formatted once per distinct set of methods.
+
+    Every claim of a library sees the same catalog, so the string is reused
+    across calls instead of re-serialized per claim, and stays byte-identical
+    for prompt caching.
+    """
+    key = tuple(m["id"] for m in methods)
+    methods_json = _methods_json_cache.get(key)
+    if methods_json is None:
+        methods_json = _format_methods_for_llm(methods)
+        _methods_json_cache[key] = methods_json
+        while len(_methods_json_cache) > METHODS_JSON_CACHE_SIZE:
+            _methods_json_cache.popitem(last=False)
+    else:
+        _methods_json_cache.move_to_end(key)
+    return methods_json
 
 
 # --- Async Processing ---
 
 MAX_CONCURRENT_REQUESTS = 50
 
+# With this many methods or fewer, every method is selected without an LLM call
+SMALL_METHOD_THRESHOLD = 8
+
 
 async def _select_methods_for_claim(
     semaphore: asyncio.Semaphore,
     selector: MethodSelector,
     claim: dict,
-    methods: list[dict],
+    methods_json: str,
     claim_idx: int,
 ) -> list[str]:
     """Select relevant methods for a single claim with semaphore-controlled concurrency."""
     async with semaphore:
         logger.info(f"Selecting methods for claim")
         claim_json = _format_claim_for_llm(claim)
-        methods_json = _format_methods_for_llm(methods)
 
         try:
-            loop = asyncio.get_event_loop()
-            method_ids = await loop.run_in_executor(
-                None, selector, claim_json, methods_json
-            )
+            method_ids = await selector.acall(claim_json, methods_json)
             logger.info(f"Selected {len(method_ids)} methods for claim")
             return method_ids
         except Exception as e:
@@ -127,11 +160,19 @@ async def select_methods_for_claims_async(
     Returns:
         List of method ID lists, one per claim
     """
+    # Too few methods to be worth narrowing down - select them all
+    if len(methods) <= SMALL_METHOD_THRESHOLD:
+        all_method_ids = [m["id"] for m in methods]
+        return [list(all_method_ids) for _ in claims]
+
     semaphore = asyncio.Semaphore(max_concurrent)
     selector = MethodSelector()
 
+    # Same catalog for every claim - look it up once, not per task
+    methods_json = _get_methods_json(methods)
+
     tasks = [
-        _select_methods_for_claim(semaphore, selector, claim, methods, i)
+        _select_methods_for_claim(semaphore, selector, claim, methods_json, i)
         for i, claim in enumerate(claims)
     ]
 
@@ -153,4 +194,4 @@ def select_methods_for_claims(
     Returns:
         List of method ID lists, one per claim
     """
-    return asyncio.run(select_methods_for_claims_async(claims, methods))
+    return run_async(select_methods_for_claims_async(claims, methods))
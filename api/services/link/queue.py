@@ -1,5 +1,6 @@
 """Queue management for library linking jobs."""
 import logging
+from functools import lru_cache
 from uuid import UUID
 
 from db import LibraryQueries
@@ -9,6 +10,18 @@ from services.jobs import JobQueue
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1)
+def _get_library_queries() -> LibraryQueries:
+    """Shared LibraryQueries (it only wraps the cached Supabase client)."""
+    return LibraryQueries()
+
+
+@lru_cache(maxsize=1)
+def _get_job_queue() -> JobQueue:
+    """Shared JobQueue (it only wraps the cached Supabase client)."""
+    return JobQueue()
+
+
 def maybe_queue_link_library(paper_id: str | UUID, exclude_job_id: str | UUID | None = None) -> list[Job]:
     """
     Check if it's safe to queue LINK_LIBRARY jobs for libraries containing this paper.
@@ -33,8 +46,8 @@ def maybe_queue_link_library(paper_id: str | UUID, exclude_job_id: str | UUID |
     paper_id_str = str(paper_id)
     logger.info(f"Checking if LINK_LIBRARY jobs should be queued for paper_id={paper_id_str}")
 
-    library_queries = LibraryQueries()
-    job_queue = JobQueue()
+    library_queries = _get_library_queries()
+    job_queue = _get_job_queue()
 
     # Get all libraries this paper belongs to
     libraries = library_queries.get_libraries_for_paper(paper_id)
@@ -47,13 +60,20 @@ def maybe_queue_link_library(paper_id: str | UUID, exclude_job_id: str | UUID |
 
     created_jobs: list[Job] = []
 
+    # Run both checks for all libraries at once (two bulk lookups instead of two per library)
+    # Exclude the current job (if provided) since it's the one triggering this check
+    library_ids = [library["id"] for library in libraries]
+    busy_library_ids = job_queue.get_libraries_with_pending_processing_jobs(
+        library_ids, exclude_job_id=exclude_job_id
+    )
+    recently_queued_library_ids = job_queue.get_libraries_with_recent_pending_link_job(library_ids)
+
     for library in libraries:
         library_id = library["id"]
         library_title = library.get("title", "Untitled")
 
         # Check 1: Are there pending/running processing jobs for papers in this library?
-        # Exclude the current job (if provided) since it's the one triggering this check
-        if job_queue.has_pending_processing_jobs_for_library(library_id, exclude_job_id=exclude_job_id):
+        if str(library_id) in busy_library_ids:
             logger.info(
                 f"Library '{library_title}' ({library_id}) has papers still being processed, "
                 "skipping LINK_LIBRARY job"
@@ -61,7 +81,7 @@ def maybe_queue_link_library(paper_id: str | UUID, exclude_job_id: str | UUID |
             continue
 
         # Check 2: Is there already a recent pending/running LINK_LIBRARY job?
-        if job_queue.has_recent_pending_link_job(library_id):
+        if str(library_id) in recently_queued_library_ids:
             logger.info(
                 f"Library '{library_title}' ({library_id}) already has a recent LINK_LIBRARY job, "
                 "skipping duplicate"
@@ -101,7 +121,7 @@ def maybe_queue_link_library_for_library(library_id: str | UUID) -> Job | None:
     library_id_str = str(library_id)
     logger.info(f"Checking if LINK_LIBRARY job should be queued for library_id={library_id_str}")
 
-    job_queue = JobQueue()
+    job_queue = _get_job_queue()
 
     # Check 1: Are there pending/running processing jobs for papers in this library?
     if job_queue.has_pending_processing_jobs_for_library(library_id):
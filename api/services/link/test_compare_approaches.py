@@ -29,6 +29,9 @@ from services.link.claim2claim_pairwise import link_claims_in_library_pairwise,
 # Output file
 RESULTS_FILE = Path(__file__).parent / "linking_comparison_results.csv"
 
+# Write buffer for the per-run links CSVs (bytes)
+CSV_BUFFER_SIZE = 1024 * 1024
+
 
 def get_batch_usage(lm) -> UsageStats:
     """Extract usage stats from LM history."""
@@ -67,31 +70,31 @@ def write_result_to_csv(row: dict):
         writer.writerow(row)
 
 
-def write_links_to_csv(links: list, approach: str, library_id: str, timestamp: str, claims_lookup: dict):
+def write_links_to_csv(links: list, approach: str, library_id: str, timestamp: str, claim_texts: dict[str, str]):
     """Write all links to a separate CSV for inspection."""
     links_file = Path(__file__).parent / f"links_{approach}_{timestamp.replace(':', '-')}.csv"
 
     fieldnames = ["approach", "library_id", "link_type", "claim_1_text", "claim_2_text", "reasoning", "claim_id_1", "claim_id_2"]
 
-    with open(links_file, "w", newline="") as f:
+    rows = [
+        {
+            "approach": approach,
+            "library_id": library_id,
+            "link_type": link.link_type.value,
+            "claim_1_text": claim_texts.get(link.claim_id_1, ""),
+            "claim_2_text": claim_texts.get(link.claim_id_2, ""),
+            "reasoning": link.reasoning,
+            "claim_id_1": link.claim_id_1,
+            "claim_id_2": link.claim_id_2,
+        }
+        for link in links
+    ]
+
+    # Large buffer so big link sets go out in few write(2) calls
+    with open(links_file, "w", newline="", buffering=CSV_BUFFER_SIZE) as f:
         writer = csv.DictWriter(f, fieldnames=fieldnames)
         writer.writeheader()
-        for link in links:
-            claim_1 = claims_lookup.get(link.claim_id_1, {})
-            claim_2 = claims_lookup.get(link.claim_id_2, {})
-            claim_1_text = claim_1.get("content", {}).get("rephrased_claim", "")
-            claim_2_text = claim_2.get("content", {}).get("rephrased_claim", "")
-
-            writer.writerow({
-                "approach": approach,
-                "library_id": library_id,
-                "link_type": link.link_type.value,
-                "claim_1_text": claim_1_text,
-                "claim_2_text": claim_2_text,
-                "reasoning": link.reasoning,
-                "claim_id_1": link.claim_id_1,
-                "claim_id_2": link.claim_id_2,
-            })
+        writer.writerows(rows)
 
     print(f"Links written to: {links_file}")
 
@@ -124,10 +127,10 @@ def main():
     claims = _fetch_claims_with_embeddings(args.library_id)
     total_claims = len(claims)
 
-    # Build lookup for claim text
-    claims_lookup = {c["id"]: c for c in claims}
+    # Build lookup for claim text only (the CSVs don't need the full rows)
+    claim_texts = {c["id"]: c["content"].get("rephrased_claim", "") for c in claims}
 
-    if args.limit and args.limit < len(claims):
+    if args.limit and args.limit < total_claims:
         print(f"Limited to {args.limit} claims for testing")
         total_claims = args.limit
 
@@ -143,7 +146,9 @@ def main():
         lm.history.clear()
         start_time = time.time()
 
-        batch_result = link_claims_in_library(args.library_id, similarity_threshold=args.threshold)
+        batch_result = link_claims_in_library(
+            args.library_id, similarity_threshold=args.threshold, claims=claims
+        )
 
         duration = time.time() - start_time
         batch_stats = get_batch_usage(lm)
@@ -177,7 +182,7 @@ def main():
 
         # Write links detail
         batch_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        write_links_to_csv(batch_result.links, "batch", args.library_id, batch_timestamp, claims_lookup)
+        write_links_to_csv(batch_result.links, "batch", args.library_id, batch_timestamp, claim_texts)
 
         if batch_result.links:
             print("Sample links:")
@@ -194,7 +199,9 @@ def main():
         lm.history.clear()
         start_time = time.time()
 
-        pairwise_result = link_claims_in_library_pairwise(args.library_id, similarity_threshold=args.threshold)
+        pairwise_result = link_claims_in_library_pairwise(
+            args.library_id, similarity_threshold=args.threshold, claims=claims
+        )
 
         duration = time.time() - start_time
         stats = pairwise_result.stats
@@ -228,7 +235,7 @@ def main():
 
         # Write links detail
         pairwise_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        write_links_to_csv(pairwise_result.result.links, "pairwise", args.library_id, pairwise_timestamp, claims_lookup)
+        write_links_to_csv(pairwise_result.result.links, "pairwise", args.library_id, pairwise_timestamp, claim_texts)
 
         if pairwise_result.result.links:
             print("Sample links:")
@@ -25,8 +25,8 @@ from services.link.method_selector import (
 )
 
 
-def get_methods_by_library(library_id: str) -> list[dict]:
-    """Fetch all method extracts for papers in a library."""
+def get_methods_and_claims_by_library(library_id: str) -> tuple[list[dict], list[dict]]:
+    """Fetch all method and claim extracts for papers in a library (one extracts query)."""
     db = get_supabase_client()
 
     # Get paper_ids from library_papers
@@ -40,47 +40,20 @@ def get_methods_by_library(library_id: str) -> list[dict]:
     paper_ids = [row["paper_id"] for row in library_papers.data]
 
     if not paper_ids:
-        return []
+        return [], []
 
-    # Fetch methods for all papers in library
+    # Fetch methods and claims for all papers in library together, split below
     result = (
         db.table("extracts")
         .select("*")
         .in_("paper_id", paper_ids)
-        .eq("type", "method")
+        .in_("type", ["method", "claim"])
         .execute()
     )
 
-    return result.data
-
-
-def get_claims_by_library(library_id: str) -> list[dict]:
-    """Fetch all claim extracts for papers in a library."""
-    db = get_supabase_client()
-
-    # Get paper_ids from library_papers
-    library_papers = (
-        db.table("library_papers")
-        .select("paper_id")
-        .eq("library_id", library_id)
-        .execute()
-    )
-
-    paper_ids = [row["paper_id"] for row in library_papers.data]
-
-    if not paper_ids:
-        return []
-
-    # Fetch claims for all papers in library
-    result = (
-        db.table("extracts")
-        .select("*")
-        .in_("paper_id", paper_ids)
-        .eq("type", "claim")
-        .execute()
-    )
-
-    return result.data
+    methods = [row for row in result.data if row["type"] == "method"]
+    claims = [row for row in result.data if row["type"] == "claim"]
+    return methods, claims
 
 
 def main():
@@ -98,12 +71,9 @@ def main():
     dspy.configure(lm=lm)
 
     # Fetch data
-    print(f"Fetching methods from library: {args.library_id}")
-    methods = get_methods_by_library(args.library_id)
+    print(f"Fetching methods and claims from library: {args.library_id}")
+    methods, all_claims = get_methods_and_claims_by_library(args.library_id)
     print(f"Found {len(methods)} methods")
-
-    print(f"\nFetching claims from library: {args.library_id}")
-    all_claims = get_claims_by_library(args.library_id)
     print(f"Found {len(all_claims)} claims")
 
     if not methods:
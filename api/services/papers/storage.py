@@ -1,14 +1,24 @@
 import asyncio
 import hashlib
+import logging
 from uuid import UUID, uuid4
 
+from pydantic import TypeAdapter
+
 from db import get_supabase_client, ExtractQueries
 from models import Paper, PaperUploadResult, JobType
 from services.jobs import JobQueue
 
+logger = logging.getLogger(__name__)
 
 BUCKET_NAME = "papers"
 
+# Max storage uploads in flight during a bulk upload
+MAX_CONCURRENT_UPLOADS = 10
+
+# Validates a whole list of paper rows in one pydantic-core call
+_PAPERS_ADAPTER = TypeAdapter(list[Paper])
+
 
 class PaperStorage:
     """Service for storing and managing paper PDFs."""
@@ -27,30 +37,37 @@ class PaperStorage:
             return Paper(**result.data[0])
         return None
 
-    def upload_paper(self, filename: str, content: bytes, content_type: str = "application/pdf") -> PaperUploadResult:
+    def _find_by_sha256s(self, sha256s: list[str]) -> dict[str, Paper]:
+        """Find existing papers for several SHA256 hashes with one query."""
+        if not sha256s:
+            return {}
+        result = self.db.table("papers").select("*").in_("sha256", sha256s).execute()
+        return {row["sha256"]: Paper(**row) for row in result.data}
+
+    def _stage_paper(
+        self,
+        filename: str,
+        content: bytes,
+        content_type: str,
+        sha256: str,
+        existing: Paper | None,
+    ) -> PaperUploadResult | dict:
         """
-        Upload a single paper PDF.
+        Handle a duplicate or upload a paper's PDF to the storage bucket.
 
-        - Computes SHA256 for deduplication
-        - Uploads to Supabase storage bucket
-        - Creates papers table record
+        Args:
+            filename: Original filename
+            content: PDF bytes
+            content_type: MIME type of the file
+            sha256: SHA256 of content
+            existing: Already-stored paper with the same SHA256, if any
 
-        Returns PaperUploadResult with success/failure info.
+        Returns:
+            A finished PaperUploadResult for duplicates and failed uploads,
+            otherwise the papers table row to insert (see _insert_papers)
         """
-        sha256 = self._compute_sha256(content)
-
-        # Check for duplicate
-        existing = self._find_by_sha256(sha256)
         if existing:
-            # If duplicate has no extracts, queue extraction job
-            extracts_db = ExtractQueries()
-            if not extracts_db.has_extracts(existing.id):
-                job_queue = JobQueue()
-                job_queue.create_job_by_type(
-                    job_type=JobType.EXTRACT_ELEMENTS,
-                    payload={"paper_id": str(existing.id)}
-                )
-
+            # Extraction for duplicates is queued by the caller (see _queue_extraction_for_duplicates)
             return PaperUploadResult(
                 filename=filename,
                 success=True,
@@ -69,65 +86,212 @@ class PaperStorage:
                 file=content,
                 file_options={"content-type": content_type}
             )
+        except Exception as e:
+            return PaperUploadResult(
+                filename=filename,
+                success=False,
+                error=str(e)
+            )
 
-            # Insert record into papers table
-            # Title defaults to filename, will be updated after parsing
-            result = self.db.table("papers").insert({
-                "id": str(paper_id),
-                "title": filename.rsplit(".", 1)[0],  # Remove .pdf extension
-                "filename": filename,
-                "storage_path": storage_path,
-                "file_size": len(content),
-                "content_type": content_type,
-                "sha256": sha256,
-            }).execute()
-
-            paper = Paper(**result.data[0])
-
-            # Create parse_paper job
+        # Title defaults to filename, will be updated after parsing
+        return {
+            "id": str(paper_id),
+            "title": filename.rsplit(".", 1)[0],  # Remove .pdf extension
+            "filename": filename,
+            "storage_path": storage_path,
+            "file_size": len(content),
+            "content_type": content_type,
+            "sha256": sha256,
+        }
+
+    def _queue_extraction_for_duplicates(self, papers: list[Paper]) -> None:
+        """Queue extract_elements jobs, in one insert, for duplicate papers that have no extracts."""
+        extracts_db = ExtractQueries()
+        paper_ids = {str(paper.id) for paper in papers}
+        payloads = [
+            {"paper_id": paper_id}
+            for paper_id in paper_ids
+            if not extracts_db.has_extracts(paper_id)
+        ]
+        if payloads:
             job_queue = JobQueue()
-            job_queue.create_job_by_type(
-                job_type=JobType.PARSE_PAPER,
-                payload={"paper_id": str(paper_id)}
+            job_queue.create_jobs_by_type(
+                job_type=JobType.EXTRACT_ELEMENTS,
+                payloads=payloads
             )
 
-            return PaperUploadResult(
-                paper=paper,
-                filename=filename,
-                success=True
-            )
+    def _remove_staged_objects(self, rows: list[dict]) -> None:
+        """Best-effort delete of the storage objects uploaded for rows that were never inserted."""
+        try:
+            self.db.storage.from_(BUCKET_NAME).remove([row["storage_path"] for row in rows])
+        except Exception as e:
+            logger.warning(f"Failed to remove {len(rows)} orphaned storage objects: {e}")
+
+    def _insert_papers(self, rows: list[dict]) -> list[PaperUploadResult]:
+        """
+        Insert staged paper rows and queue their parse_paper jobs, one bulk insert each.
 
+        Returns one PaperUploadResult per row, in row order. If the bulk
+        papers insert fails (e.g. one row conflicts), the rows are retried
+        one at a time so a single bad row does not fail the rest; the storage
+        objects of rows that still cannot be inserted are deleted. If queueing
+        the jobs fails, every row is reported as failed.
+        """
+        try:
+            # Insert records into papers table
+            result = self.db.table("papers").insert(rows).execute()
         except Exception as e:
-            return PaperUploadResult(
-                filename=filename,
-                success=False,
-                error=str(e)
+            if len(rows) > 1:
+                return [retried for row in rows for retried in self._insert_papers([row])]
+            self._remove_staged_objects(rows)
+            return [
+                PaperUploadResult(
+                    filename=rows[0]["filename"],
+                    success=False,
+                    error=str(e)
+                )
+            ]
+
+        papers_by_id = {row["id"]: Paper(**row) for row in result.data}
+
+        try:
+            # Create parse_paper jobs
+            job_queue = JobQueue()
+            job_queue.create_jobs_by_type(
+                job_type=JobType.PARSE_PAPER,
+                payloads=[{"paper_id": row["id"]} for row in rows]
             )
 
+            return [
+                PaperUploadResult(
+                    paper=papers_by_id[row["id"]],
+                    filename=row["filename"],
+                    success=True
+                )
+                for row in rows
+            ]
+
+        except Exception as e:
+            return [
+                PaperUploadResult(
+                    filename=row["filename"],
+                    success=False,
+                    error=str(e)
+                )
+                for row in rows
+            ]
+
+    def upload_paper(self, filename: str, content: bytes, content_type: str = "application/pdf") -> PaperUploadResult:
+        """
+        Upload a single paper PDF.
+
+        - Computes SHA256 for deduplication
+        - Uploads to Supabase storage bucket
+        - Creates papers table record
+
+        Returns PaperUploadResult with success/failure info.
+        """
+        sha256 = self._compute_sha256(content)
+        existing = self._find_by_sha256(sha256)
+        if existing:
+            # If duplicate has no extracts, queue extraction job
+            self._queue_extraction_for_duplicates([existing])
+        staged = self._stage_paper(filename, content, content_type, sha256, existing)
+        if isinstance(staged, PaperUploadResult):
+            return staged
+        return self._insert_papers([staged])[0]
+
     async def upload_papers(self, files: list[tuple[str, bytes, str]]) -> list[PaperUploadResult]:
         """
         Upload multiple papers concurrently.
 
+        Duplicates are looked up with one query for all files. Storage uploads
+        (the slow, per-file HTTPS requests) run concurrently; the papers rows
+        and their parse_paper jobs are then written with one bulk insert each
+        instead of two inserts per file. A file repeated within the batch is
+        reported as a duplicate of its first occurrence.
+
         Args:
             files: List of (filename, content, content_type) tuples
 
         Returns:
             List of PaperUploadResult for each file
         """
-        semaphore = asyncio.Semaphore(10)  # Cap concurrent uploads
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_UPLOADS)
+        loop = asyncio.get_running_loop()
 
-        async def upload_with_limit(filename: str, content: bytes, content_type: str):
+        # Hash all files, then look up every existing duplicate in one query.
+        # One executor task per file: hashlib releases the GIL while hashing,
+        # so large PDFs hash in parallel across cores
+        sha256s = await asyncio.gather(*[
+            loop.run_in_executor(None, self._compute_sha256, content)
+            for _, content, _ in files
+        ])
+        existing_by_sha = await loop.run_in_executor(
+            None, self._find_by_sha256s, list(set(sha256s))
+        )
+        if existing_by_sha:
+            # Duplicates without extracts get their extraction jobs in one insert
+            await loop.run_in_executor(
+                None, self._queue_extraction_for_duplicates, list(existing_by_sha.values())
+            )
+
+        # Only the first file per hash is staged; repeats resolve against it below
+        first_index_by_sha: dict[str, int] = {}
+        for i, sha256 in enumerate(sha256s):
+            first_index_by_sha.setdefault(sha256, i)
+
+        async def stage_with_limit(i: int):
+            filename, content, content_type = files[i]
+            sha256 = sha256s[i]
             async with semaphore:
-                loop = asyncio.get_event_loop()
                 return await loop.run_in_executor(
-                    None, self.upload_paper, filename, content, content_type
+                    None, self._stage_paper,
+                    filename, content, content_type, sha256, existing_by_sha.get(sha256),
                 )
 
-        tasks = [
-            upload_with_limit(filename, content, content_type)
-            for filename, content, content_type in files
-        ]
-        return await asyncio.gather(*tasks)
+        first_indices = list(first_index_by_sha.values())
+        staged_by_index = dict(zip(
+            first_indices,
+            await asyncio.gather(*[stage_with_limit(i) for i in first_indices]),
+        ))
+
+        rows = [item for item in staged_by_index.values() if not isinstance(item, PaperUploadResult)]
+        inserted: list[PaperUploadResult] = []
+        if rows:
+            inserted = await loop.run_in_executor(None, self._insert_papers, rows)
+
+        # Finished results as-is, staged rows from the bulk insert
+        inserted_results = iter(inserted)
+        result_by_index = {
+            i: item if isinstance(item, PaperUploadResult) else next(inserted_results)
+            for i, item in staged_by_index.items()
+        }
+
+        # Results in input order
+        results = []
+        for i, (filename, _, _) in enumerate(files):
+            first_index = first_index_by_sha[sha256s[i]]
+            if i == first_index:
+                results.append(result_by_index[i])
+                continue
+
+            first = result_by_index[first_index]
+            duplicate_of = first.paper.id if first.paper else first.duplicate_of
+            if duplicate_of:
+                results.append(PaperUploadResult(
+                    filename=filename,
+                    success=True,
+                    duplicate_of=duplicate_of,
+                    error="Duplicate file already exists"
+                ))
+            else:
+                results.append(PaperUploadResult(
+                    filename=filename,
+                    success=False,
+                    error=first.error
+                ))
+        return results
 
     def get_paper(self, paper_id: UUID) -> Paper | None:
         """Get a paper by ID."""
@@ -145,4 +309,4 @@ class PaperStorage:
             .limit(limit)
             .execute()
         )
-        return [Paper(**row) for row in result.data]
+        return _PAPERS_ADAPTER.validate_python(result.data)
@@ -1,6 +1,13 @@
 from .grobid import GrobidParser
 from .handler import handle_parse_paper
-from .tei_processor import add_element_ids, extract_element_by_id, list_element_ids
+from .tei_processor import (
+    add_element_ids,
+    add_element_ids_to_tree,
+    tei_tree_to_string,
+    extract_element_by_id,
+    index_element_ids,
+    list_element_ids,
+)
 from .screenshots import extract_figure_screenshots, save_screenshots_to_bucket
 from .metadata_extractor import extract_metadata
 
@@ -8,7 +15,10 @@ __all__ = [
     "GrobidParser",
     "handle_parse_paper",
     "add_element_ids",
+    "add_element_ids_to_tree",
+    "tei_tree_to_string",
     "extract_element_by_id",
+    "index_element_ids",
     "list_element_ids",
     "extract_figure_screenshots",
     "save_screenshots_to_bucket",
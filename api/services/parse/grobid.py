@@ -1,6 +1,20 @@
 import os
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Connect / read timeouts in seconds - PDFs can take a while to process
+GROBID_TIMEOUT = (5, 300)
+
+# Grobid answers 503 when all its workers are busy; retry those with backoff
+GROBID_RETRY = Retry(
+    total=3,
+    backoff_factor=0.2,
+    status_forcelist=[502, 503, 504],
+    allowed_methods=["POST"],
+    raise_on_status=False,  # hand the last response back so raise_for_status raises HTTPError
+)
 
 
 class GrobidParser:
@@ -9,6 +23,12 @@ class GrobidParser:
     def __init__(self):
         self.base_url = os.getenv("PARSER_URL", "http://localhost:8070")
 
+        # Pooled keep-alive connections, reused for every PDF this parser sends
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=GROBID_RETRY)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
     def parse_pdf(self, pdf_content: bytes, filename: str = "document.pdf") -> str:
         """
         Send a PDF to Grobid and return the TEI XML.
@@ -34,11 +54,11 @@ class GrobidParser:
             "consolidateHeader": "0"
         }
 
-        response = requests.post(
+        response = self.session.post(
             f"{self.base_url}/api/processFulltextDocument",
             files=files,
             data=data,
-            timeout=300  # 5 minute timeout - PDFs can take a while
+            timeout=GROBID_TIMEOUT
         )
 
         response.raise_for_status()
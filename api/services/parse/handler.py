@@ -1,10 +1,15 @@
 """Handler for parse_paper jobs."""
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Any
+from xml.etree import ElementTree as ET
+
+from postgrest import ReturnMethod
 
 from db import get_supabase_client
 from services.parse.grobid import GrobidParser
-from services.parse.tei_processor import add_element_ids
+from services.parse.tei_processor import add_element_ids_to_tree, tei_tree_to_string
 from services.parse.screenshots import extract_figure_screenshots, save_screenshots_to_bucket
 from services.parse.metadata_extractor import extract_metadata
 
@@ -13,6 +18,22 @@ logger = logging.getLogger(__name__)
 BUCKET_NAME = "papers"
 
 
+@lru_cache(maxsize=1)
+def _get_grobid_parser() -> GrobidParser:
+    """Shared GrobidParser, so its connection pool is reused across jobs in a worker process."""
+    return GrobidParser()
+
+
+def _extract_and_save_figures(db, paper_id: str, pdf_content: bytes, tei_root: ET.Element) -> list[str]:
+    """Extract figure/table screenshots from the PDF and save them to the bucket."""
+    screenshots = extract_figure_screenshots(pdf_content, tei_root)
+    if not screenshots:
+        return []
+    figure_paths = save_screenshots_to_bucket(db, paper_id, screenshots, BUCKET_NAME)
+    logger.info(f"Saved {len(figure_paths)} figure screenshots")
+    return figure_paths
+
+
 def handle_parse_paper(payload: dict[str, Any]) -> dict[str, Any]:
     """
     Parse a paper PDF using Grobid.
@@ -49,35 +70,42 @@ def handle_parse_paper(payload: dict[str, Any]) -> dict[str, Any]:
 
     # 3. Parse with Grobid
     logger.info("Sending PDF to Grobid")
-    parser = GrobidParser()
+    parser = _get_grobid_parser()
     tei_xml = parser.parse_pdf(pdf_content, paper["filename"])
     logger.info(f"Received TEI XML ({len(tei_xml)} chars)")
 
-    # 4. Add hierarchical IDs to body elements
+    # 4. Add hierarchical IDs to body elements. The TEI is parsed once here;
+    # screenshot and metadata extraction read the same tree
     logger.info("Adding element IDs to TEI")
-    tei_xml = add_element_ids(tei_xml)
+    tei_root = ET.fromstring(tei_xml)
+    if add_element_ids_to_tree(tei_root):
+        tei_xml = tei_tree_to_string(tei_root)
 
-    # 5. Save TEI to bucket
+    # Steps 5-7 only depend on the TEI and PDF, so they run concurrently;
+    # the paper record is updated once all of them have finished
     parsed_path = f"{paper_id}/parsed.tei"
-    logger.info(f"Saving TEI to {parsed_path}")
-
-    db.storage.from_(BUCKET_NAME).upload(
-        path=parsed_path,
-        file=tei_xml.encode("utf-8"),
-        file_options={"content-type": "application/xml"}
-    )
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        # 5. Save TEI to bucket
+        logger.info(f"Saving TEI to {parsed_path}")
+        tei_upload_future = executor.submit(
+            db.storage.from_(BUCKET_NAME).upload,
+            path=parsed_path,
+            file=tei_xml.encode("utf-8"),
+            file_options={"content-type": "application/xml"}
+        )
+
+        # 6. Extract and save figure/table screenshots
+        logger.info("Extracting figure screenshots")
+        figures_future = executor.submit(_extract_and_save_figures, db, paper_id, pdf_content, tei_root)
+
+        # 7. Extract metadata (title, abstract, references)
+        logger.info("Extracting metadata from TEI")
+        metadata_future = executor.submit(extract_metadata, tei_root)
+
+        tei_upload_future.result()
+        figure_paths = figures_future.result()
+        metadata = metadata_future.result()
 
-    # 6. Extract figure/table screenshots
-    logger.info("Extracting figure screenshots")
-    screenshots = extract_figure_screenshots(pdf_content, tei_xml)
-    figure_paths = []
-    if screenshots:
-        figure_paths = save_screenshots_to_bucket(db, paper_id, screenshots, BUCKET_NAME)
-        logger.info(f"Saved {len(figure_paths)} figure screenshots")
-
-    # 7. Extract metadata (title, abstract, references)
-    logger.info("Extracting metadata from TEI")
-    metadata = extract_metadata(tei_xml)
     parsed_title = metadata.get("title")
     logger.info(f"Extracted title: {parsed_title}, abstract: {bool(metadata.get('abstract'))}, refs: {len(metadata.get('references', []))}")
 
@@ -96,7 +124,8 @@ def handle_parse_paper(payload: dict[str, Any]) -> dict[str, Any]:
     if parsed_title:
         update_data["title"] = parsed_title
 
-    db.table("papers").update(update_data).eq("id", paper_id).execute()
+    # Minimal return: nothing reads the updated row, and it carries the full references list
+    db.table("papers").update(update_data, returning=ReturnMethod.minimal).eq("id", paper_id).execute()
     logger.info(f"Updated paper {paper_id} with parsed_path and metadata")
 
     # 9. Create extract_elements job to run extractions
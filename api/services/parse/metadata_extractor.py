@@ -43,20 +43,10 @@ def extract_abstract(root: ET.Element) -> str | None:
     if abstract_elem is None:
         return None
 
-    # Collect all text from the abstract element and its children
-    texts = []
-    for elem in abstract_elem.iter():
-        if elem.text:
-            texts.append(elem.text.strip())
-        if elem.tail:
-            texts.append(elem.tail.strip())
-
-    # Filter empty strings and join
-    text_parts = [t for t in texts if t]
-    if not text_parts:
-        return None
-
-    return " ".join(text_parts)
+    # Collect all text from the abstract element and its children in
+    # document order, collapsing whitespace
+    text = " ".join(" ".join(abstract_elem.itertext()).split())
+    return text or None
 
 
 def extract_authors(root: ET.Element) -> list[str]:
@@ -67,7 +57,7 @@ def extract_authors(root: ET.Element) -> list[str]:
         return authors
 
     # Authors are in analytic section
-    for author in bibl_struct.findall(".//tei:analytic/tei:author/tei:persName", TEI_NS):
+    for author in bibl_struct.iterfind(".//tei:analytic/tei:author/tei:persName", TEI_NS):
         name_parts = []
         forename = author.find("tei:forename", TEI_NS)
         surname = author.find("tei:surname", TEI_NS)
@@ -142,7 +132,7 @@ def extract_references(root: ET.Element) -> list[BiblReference]:
     if list_bibl is None:
         return references
 
-    for bibl_struct in list_bibl.findall("tei:biblStruct", TEI_NS):
+    for bibl_struct in list_bibl.iterfind("tei:biblStruct", TEI_NS):
         ref_id = bibl_struct.get("{http://www.w3.org/XML/1998/namespace}id", "")
 
         # Extract title from analytic (article) or monogr (book/journal)
@@ -155,7 +145,7 @@ def extract_references(root: ET.Element) -> list[BiblReference]:
 
         # Extract authors
         authors = []
-        for author in bibl_struct.findall(".//tei:author/tei:persName", TEI_NS):
+        for author in bibl_struct.iterfind(".//tei:author/tei:persName", TEI_NS):
             name_parts = []
             forename = author.find("tei:forename", TEI_NS)
             surname = author.find("tei:surname", TEI_NS)
@@ -198,17 +188,17 @@ def extract_references(root: ET.Element) -> list[BiblReference]:
     return references
 
 
-def extract_metadata(tei_xml: str) -> PaperMetadata:
+def extract_metadata(tei_xml: str | ET.Element) -> PaperMetadata:
     """
     Extract title, abstract, authors, year, journal, DOI, and references from TEI XML.
 
     Args:
-        tei_xml: The TEI XML content as a string
+        tei_xml: The TEI XML content as a string, or its already-parsed root element
 
     Returns:
         PaperMetadata with title, abstract, authors, year, journal, doi, and references
     """
-    root = ET.fromstring(tei_xml)
+    root = ET.fromstring(tei_xml) if isinstance(tei_xml, str) else tei_xml
 
     title = extract_title(root)
     abstract = extract_abstract(root)
@@ -1,6 +1,7 @@
 """Extract screenshots of figures and tables from PDFs using TEI coordinates."""
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
 from xml.etree import ElementTree as ET
 
@@ -12,6 +13,14 @@ logger = logging.getLogger(__name__)
 TEI_NS = "http://www.tei-c.org/ns/1.0"
 XML_NS = "http://www.w3.org/XML/1998/namespace"
 
+# Qualified tag/attribute names, built once instead of per figure
+_XML_ID = f"{{{XML_NS}}}id"
+_FIGURE_TAG = f"{{{TEI_NS}}}figure"
+_GRAPHIC_TAG = f"{{{TEI_NS}}}graphic"
+
+# Max screenshot uploads in flight per paper
+MAX_CONCURRENT_SCREENSHOT_UPLOADS = 8
+
 
 def parse_coords(coords_str: str) -> list[dict]:
     """
@@ -45,19 +54,27 @@ def get_bounding_box(regions: list[dict]) -> dict | None:
         return None
 
     # Check if all regions are on the same page
-    pages = set(r["page"] for r in regions)
-    if len(pages) > 1:
-        # For multi-page figures, just use the first region
-        logger.warning("Figure spans multiple pages, using first region only")
-        regions = [r for r in regions if r["page"] == min(pages)]
-
-    page = regions[0]["page"]
-
-    # Calculate bounding box
-    min_x = min(r["x"] for r in regions)
-    min_y = min(r["y"] for r in regions)
-    max_x = max(r["x"] + r["width"] for r in regions)
-    max_y = max(r["y"] + r["height"] for r in regions)
+    page = min(r["page"] for r in regions)
+    if any(r["page"] != page for r in regions):
+        # For multi-page figures, just use the regions on the first page
+        logger.warning("Figure spans multiple pages, using first page only")
+
+    # Calculate bounding box over the first page's regions in one pass
+    min_x = min_y = float("inf")
+    max_x = max_y = float("-inf")
+    for r in regions:
+        if r["page"] != page:
+            continue
+        x = r["x"]
+        y = r["y"]
+        if x < min_x:
+            min_x = x
+        if y < min_y:
+            min_y = y
+        if x + r["width"] > max_x:
+            max_x = x + r["width"]
+        if y + r["height"] > max_y:
+            max_y = y + r["height"]
 
     return {
         "page": page,
@@ -70,39 +87,45 @@ def get_bounding_box(regions: list[dict]) -> dict | None:
 
 def extract_figure_screenshots(
     pdf_content: bytes,
-    tei_xml: str,
-    dpi: int = 150
+    tei_xml: str | ET.Element,
+    dpi: int = 150,
+    pdf_doc: fitz.Document | None = None,
 ) -> list[dict]:
     """
     Extract screenshots of all figures and tables from a PDF.
 
     Args:
         pdf_content: Raw PDF bytes
-        tei_xml: TEI XML string with figure/table coords
+        tei_xml: TEI XML string with figure/table coords, or its already-parsed root element
         dpi: Resolution for screenshots (default 150)
+        pdf_doc: The PDF already opened by the caller. It is left open;
+            if omitted, pdf_content is opened here and closed afterwards
 
     Returns:
         List of {id, type, image_bytes, filename} dicts
     """
     # Parse TEI XML
-    root = ET.fromstring(tei_xml)
+    root = ET.fromstring(tei_xml) if isinstance(tei_xml, str) else tei_xml
 
     # Find all figures (includes tables with type="table")
-    figures = root.findall(f".//{{{TEI_NS}}}figure")
+    figures = root.findall(f".//{_FIGURE_TAG}")
 
     if not figures:
         logger.info("No figures found in TEI")
         return []
 
-    # Open PDF
-    pdf_doc = fitz.open(stream=pdf_content, filetype="pdf")
+    # Open PDF, unless the caller already has it open
+    owns_doc = pdf_doc is None
+    if owns_doc:
+        pdf_doc = fitz.open(stream=pdf_content, filetype="pdf")
 
     screenshots = []
     zoom = dpi / 72  # PDF default is 72 DPI
+    mat = fitz.Matrix(zoom, zoom)  # Same scale for every figure
 
     for fig in figures:
         # Get xml:id
-        fig_id = fig.get(f"{{{XML_NS}}}id")
+        fig_id = fig.get(_XML_ID)
         if not fig_id:
             continue
 
@@ -110,7 +133,7 @@ def extract_figure_screenshots(
         coords_str = fig.get("coords")
         if not coords_str:
             # Try to get coords from nested graphic element
-            graphic = fig.find(f"{{{TEI_NS}}}graphic")
+            graphic = fig.find(_GRAPHIC_TAG)
             if graphic is not None:
                 coords_str = graphic.get("coords")
 
@@ -142,7 +165,6 @@ def extract_figure_screenshots(
         )
 
         # Render the clipped region
-        mat = fitz.Matrix(zoom, zoom)
         pix = page.get_pixmap(matrix=mat, clip=clip)
 
         # Convert to PNG bytes
@@ -162,7 +184,8 @@ def extract_figure_screenshots(
 
         logger.info(f"Extracted screenshot for {fig_id} ({fig_type}) from page {page_num + 1}")
 
-    pdf_doc.close()
+    if owns_doc:
+        pdf_doc.close()
 
     return screenshots
 
@@ -178,23 +201,33 @@ def save_screenshots_to_bucket(
 
     Saves to: {paper_id}/figures/{fig_id}.png
 
-    Returns list of storage paths.
+    Uploads run concurrently (up to MAX_CONCURRENT_SCREENSHOT_UPLOADS).
+
+    Returns list of storage paths (in screenshot order) for the uploads that succeeded.
     """
-    paths = []
+    if not screenshots:
+        return []
 
-    for shot in screenshots:
+    bucket = db.storage.from_(bucket_name)
+
+    def upload(shot: dict) -> str | None:
         storage_path = f"{paper_id}/figures/{shot['filename']}"
 
         try:
-            db.storage.from_(bucket_name).upload(
+            bucket.upload(
                 path=storage_path,
                 file=shot["image_bytes"],
                 file_options={"content-type": "image/png"}
             )
-            paths.append(storage_path)
             logger.info(f"Saved {storage_path}")
+            return storage_path
 
         except Exception as e:
             logger.error(f"Failed to save {storage_path}: {e}")
+            return None
+
+    max_workers = min(MAX_CONCURRENT_SCREENSHOT_UPLOADS, len(screenshots))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(upload, screenshots))
 
-    return paths
+    return [path for path in results if path is not None]
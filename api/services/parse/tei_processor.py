@@ -1,5 +1,4 @@
 """Post-process TEI XML to add hierarchical IDs to body elements."""
-import re
 from xml.etree import ElementTree as ET
 
 
@@ -13,44 +12,91 @@ ET.register_namespace("xml", XML_NS)
 ET.register_namespace("xlink", "http://www.w3.org/1999/xlink")
 ET.register_namespace("xsi", "http://www.w3.org/2001/XMLSchema-instance")
 
+# Qualified tag/attribute names, built once instead of per element
+_TEI_PREFIX = f"{{{TEI_NS}}}"
+_XML_ID = f"{{{XML_NS}}}id"
+_ABSTRACT_TAG = f"{{{TEI_NS}}}abstract"
+_BODY_TAG = f"{{{TEI_NS}}}body"
+_DIV_TAG = f"{{{TEI_NS}}}div"
+_HEAD_TAG = f"{{{TEI_NS}}}head"
+_P_TAG = f"{{{TEI_NS}}}p"
+_S_TAG = f"{{{TEI_NS}}}s"
 
-def _add_ids_to_div(div, div_id: str) -> None:
-    """Add IDs to heads, paragraphs, and sentences within a div."""
-    # Only add ID if not already present
-    if f"{{{XML_NS}}}id" not in div.attrib:
-        div.set(f"{{{XML_NS}}}id", div_id)
+
+def _local_name(tag: str) -> str:
+    """Strip the TEI namespace from a qualified tag name."""
+    return tag[len(_TEI_PREFIX):] if tag.startswith(_TEI_PREFIX) else tag
+
+
+def _set_id(elem, elem_id: str) -> bool:
+    """Set xml:id on an element unless it already has one. Returns whether it was set."""
+    if _XML_ID in elem.attrib:
+        return False
+    elem.set(_XML_ID, elem_id)
+    return True
+
+
+def _add_ids_to_p(p, p_id: str) -> bool:
+    """Add IDs to a paragraph and the sentences within it. Returns whether any were added."""
+    added = _set_id(p, p_id)
+
+    for s_counter, s in enumerate(p.iterfind(_S_TAG), 1):
+        added |= _set_id(s, f"{p_id}-s{s_counter}")
+
+    return added
+
+
+def _add_ids_to_div(div, div_id: str) -> bool:
+    """Add IDs to heads, paragraphs, and sentences within a div. Returns whether any were added."""
+    added = _set_id(div, div_id)
 
     head_counter = 0
     p_counter = 0
 
     for child in div:
-        tag = child.tag.replace(f"{{{TEI_NS}}}", "")
+        tag = child.tag
 
-        if tag == "head":
+        if tag == _HEAD_TAG:
             head_counter += 1
-            head_id = f"{div_id}-h{head_counter}"
-            if f"{{{XML_NS}}}id" not in child.attrib:
-                child.set(f"{{{XML_NS}}}id", head_id)
+            added |= _set_id(child, f"{div_id}-h{head_counter}")
 
-        elif tag == "p":
+        elif tag == _P_TAG:
             p_counter += 1
-            p_id = f"{div_id}-p{p_counter}"
-            if f"{{{XML_NS}}}id" not in child.attrib:
-                child.set(f"{{{XML_NS}}}id", p_id)
+            added |= _add_ids_to_p(child, f"{div_id}-p{p_counter}")
 
-            # Process sentences within paragraph
-            s_counter = 0
-            for s in child.findall(f"{{{TEI_NS}}}s"):
-                s_counter += 1
-                s_id = f"{p_id}-s{s_counter}"
-                if f"{{{XML_NS}}}id" not in s.attrib:
-                    s.set(f"{{{XML_NS}}}id", s_id)
+    return added
 
 
 def add_element_ids(tei_xml: str) -> str:
     """
     Add hierarchical IDs to elements in the TEI abstract and body.
 
+    Parses the XML, applies add_element_ids_to_tree, and serializes it back.
+    If every element already has its ID, the input is returned unchanged.
+    """
+    root = ET.fromstring(tei_xml)
+    if not add_element_ids_to_tree(root):
+        return tei_xml
+    return tei_tree_to_string(root)
+
+
+def tei_tree_to_string(root: ET.Element) -> str:
+    """Serialize a TEI tree to a string with an XML declaration."""
+    # Convert back to string
+    output = ET.tostring(root, encoding="unicode")
+
+    # Add XML declaration back
+    return '<?xml version="1.0" encoding="UTF-8"?>\n' + output
+
+
+def add_element_ids_to_tree(root: ET.Element) -> bool:
+    """
+    Add hierarchical IDs to elements in the TEI abstract and body, in place.
+
+    For callers that keep working with the parsed tree (saves re-parsing).
+    Returns whether any ID was added, so callers can skip re-serializing
+    an unchanged tree.
+
     ID schema:
     - abstract divs: abs-d1, abs-d2... (or abs if no divs)
     - body divs: d1, d2, d3...
@@ -60,92 +106,97 @@ def add_element_ids(tei_xml: str) -> str:
 
     Existing xml:id attributes (e.g., on figures, tables) are preserved.
     """
-    # Parse XML
-    root = ET.fromstring(tei_xml)
+    added = False
 
     # Process abstract
-    abstract = root.find(f".//{{{TEI_NS}}}abstract")
+    abstract = root.find(f".//{_ABSTRACT_TAG}")
     if abstract is not None:
         # Check if abstract has divs
-        abstract_divs = abstract.findall(f"{{{TEI_NS}}}div")
+        abstract_divs = abstract.findall(_DIV_TAG)
         if abstract_divs:
             # Process each div in abstract
             for i, div in enumerate(abstract_divs, 1):
-                _add_ids_to_div(div, f"abs-d{i}")
+                added |= _add_ids_to_div(div, f"abs-d{i}")
         else:
             # Abstract has no divs, treat the abstract itself as a container
             # Add IDs to paragraphs and sentences directly in abstract
             p_counter = 0
             for child in abstract:
-                tag = child.tag.replace(f"{{{TEI_NS}}}", "")
-                if tag == "p":
+                if child.tag == _P_TAG:
                     p_counter += 1
-                    p_id = f"abs-p{p_counter}"
-                    if f"{{{XML_NS}}}id" not in child.attrib:
-                        child.set(f"{{{XML_NS}}}id", p_id)
-
-                    # Process sentences within paragraph
-                    s_counter = 0
-                    for s in child.findall(f"{{{TEI_NS}}}s"):
-                        s_counter += 1
-                        s_id = f"{p_id}-s{s_counter}"
-                        if f"{{{XML_NS}}}id" not in s.attrib:
-                            s.set(f"{{{XML_NS}}}id", s_id)
+                    added |= _add_ids_to_p(child, f"abs-p{p_counter}")
 
     # Find body element
-    body = root.find(f".//{{{TEI_NS}}}body")
+    body = root.find(f".//{_BODY_TAG}")
     if body is not None:
         # Process divs in body
-        div_counter = 0
-        for div in body.findall(f"{{{TEI_NS}}}div"):
-            div_counter += 1
-            _add_ids_to_div(div, f"d{div_counter}")
-
-    # Convert back to string
-    output = ET.tostring(root, encoding="unicode")
-
-    # Add XML declaration back
-    output = '<?xml version="1.0" encoding="UTF-8"?>\n' + output
+        for div_counter, div in enumerate(body.iterfind(_DIV_TAG), 1):
+            added |= _add_ids_to_div(div, f"d{div_counter}")
 
-    return output
+    return added
 
 
-def extract_element_by_id(tei_xml: str, element_id: str) -> str | None:
+def extract_element_by_id(tei_xml: str | ET.Element, element_id: str) -> str | None:
     """
     Extract the text content of an element by its ID.
 
     Useful for retrieving source text when LLM references an element ID.
+    Accepts the TEI XML string or its already-parsed root element. For
+    several lookups on the same paper, build index_element_ids once instead.
     """
-    root = ET.fromstring(tei_xml)
+    root = ET.fromstring(tei_xml) if isinstance(tei_xml, str) else tei_xml
 
     # Search for element with matching xml:id
     for elem in root.iter():
-        if elem.get(f"{{{XML_NS}}}id") == element_id:
+        if elem.get(_XML_ID) == element_id:
             # Get all text content including nested elements
             return "".join(elem.itertext()).strip()
 
     return None
 
 
-def list_element_ids(tei_xml: str) -> list[dict]:
+def index_element_ids(tei_xml: str | ET.Element) -> dict[str, ET.Element]:
+    """
+    Map every xml:id in the TEI to its element, in a single pass.
+
+    Accepts the TEI XML string or its already-parsed root element.
+    If an ID occurs more than once, the first element wins.
+    """
+    root = ET.fromstring(tei_xml) if isinstance(tei_xml, str) else tei_xml
+    index = {}
+
+    for elem in root.iter():
+        elem_id = elem.get(_XML_ID)
+        if elem_id and elem_id not in index:
+            index[elem_id] = elem
+
+    return index
+
+
+def list_element_ids(tei_xml: str | ET.Element) -> list[dict]:
     """
     List all elements with IDs and their text preview.
 
+    Accepts the TEI XML string or its already-parsed root element.
+
     Returns list of {id, tag, text_preview} dicts.
     """
-    root = ET.fromstring(tei_xml)
+    root = ET.fromstring(tei_xml) if isinstance(tei_xml, str) else tei_xml
     elements = []
 
+    # Every element with an ID, repeats included (unlike index_element_ids)
     for elem in root.iter():
-        elem_id = elem.get(f"{{{XML_NS}}}id")
-        if elem_id:
-            text = "".join(elem.itertext()).strip()
-            text_preview = text[:100] + "..." if len(text) > 100 else text
-
-            elements.append({
-                "id": elem_id,
-                "tag": elem.tag.replace(f"{{{TEI_NS}}}", ""),
-                "text_preview": text_preview
-            })
+        elem_id = elem.get(_XML_ID)
+        if not elem_id:
+            continue
+
+        text = "".join(elem.itertext()).strip()
+        text_preview = text[:100] + "..." if len(text) > 100 else text
+
+        elements.append({
+            "id": elem_id,
+            "tag": _local_name(elem.tag),
+            "text_preview": text_preview
+        })
 
     return elements
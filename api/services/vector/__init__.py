@@ -1,4 +1,4 @@
 """Embedding services for vectorizing text."""
-from .embedder import embed_texts, embed_text
+from .embedder import embed_texts, embed_texts_async, embed_text
 
-__all__ = ["embed_texts", "embed_text"]
+__all__ = ["embed_texts", "embed_texts_async", "embed_text"]
@@ -1,28 +1,128 @@
 """Embedding utilities using OpenAI's embedding API."""
+import asyncio
 import logging
 import os
 from typing import Sequence
 
 import openai
 
+from services.async_runner import run_async
+
 logger = logging.getLogger(__name__)
 
 # OpenAI embedding model config
 EMBEDDING_MODEL = "text-embedding-3-small"
 EMBEDDING_DIMENSIONS = 1536
 
+# The embeddings endpoint accepts at most this many inputs per request
+MAX_TEXTS_PER_REQUEST = 2048
 
-def _get_client() -> openai.OpenAI:
-    """Get OpenAI client, using OPENAI_API_KEY from environment."""
+# Max embedding requests in flight when a call spans several batches
+MAX_CONCURRENT_REQUESTS = 8
+
+
+def _get_api_key() -> str:
+    """Get OPENAI_API_KEY from environment."""
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         raise ValueError("OPENAI_API_KEY environment variable is required")
-    return openai.OpenAI(api_key=api_key)
+    return api_key
+
+
+def _get_client() -> openai.OpenAI:
+    """Get OpenAI client, using OPENAI_API_KEY from environment."""
+    return openai.OpenAI(api_key=_get_api_key())
+
+
+def _get_async_client() -> openai.AsyncOpenAI:
+    """Get async OpenAI client, using OPENAI_API_KEY from environment."""
+    return openai.AsyncOpenAI(api_key=_get_api_key())
+
+
+def _batches(texts: Sequence[str]) -> list[list[str]]:
+    """Split texts into request-sized batches, preserving order."""
+    return [
+        list(texts[i:i + MAX_TEXTS_PER_REQUEST])
+        for i in range(0, len(texts), MAX_TEXTS_PER_REQUEST)
+    ]
+
+
+def _expand_duplicates(
+    texts: Sequence[str],
+    unique_texts: list[str],
+    unique_embeddings: list[list[float]],
+) -> list[list[float]]:
+    """Map embeddings of the unique texts back onto every input position."""
+    by_text = dict(zip(unique_texts, unique_embeddings))
+    return [by_text[text] for text in texts]
+
+
+def _sorted_embeddings(response) -> list[list[float]]:
+    """Embedding vectors from a response, in input order."""
+    # Sort by index to ensure order matches input
+    sorted_embeddings = sorted(response.data, key=lambda x: x.index)
+    return [item.embedding for item in sorted_embeddings]
+
+
+async def _embed_batch(
+    semaphore: asyncio.Semaphore,
+    client: openai.AsyncOpenAI,
+    batch: list[str],
+) -> list[list[float]]:
+    """Embed one batch with semaphore-controlled concurrency."""
+    async with semaphore:
+        response = await client.embeddings.create(
+            model=EMBEDDING_MODEL,
+            input=batch,
+            dimensions=EMBEDDING_DIMENSIONS,
+        )
+    return _sorted_embeddings(response)
+
+
+async def embed_texts_async(
+    texts: Sequence[str],
+    max_concurrent: int = MAX_CONCURRENT_REQUESTS,
+) -> list[list[float]]:
+    """
+    Embed texts concurrently, one API request per batch of MAX_TEXTS_PER_REQUEST.
+
+    Args:
+        texts: List of texts to embed
+        max_concurrent: Maximum concurrent embedding requests
+
+    Returns:
+        List of embedding vectors (each is a list of floats), in input order
+    """
+    if not texts:
+        return []
+
+    # Identical texts are embedded once
+    unique_texts = list(dict.fromkeys(texts))
+    if len(unique_texts) < len(texts):
+        unique_embeddings = await embed_texts_async(unique_texts, max_concurrent)
+        return _expand_duplicates(texts, unique_texts, unique_embeddings)
+
+    logger.info(f"Embedding {len(texts)} texts with {EMBEDDING_MODEL}")
+
+    semaphore = asyncio.Semaphore(max_concurrent)
+    async with _get_async_client() as client:
+        tasks = [_embed_batch(semaphore, client, batch) for batch in _batches(texts)]
+        results = await asyncio.gather(*tasks)
+
+    # gather keeps batch order, so concatenating restores input order
+    embeddings = [embedding for batch_embeddings in results for embedding in batch_embeddings]
+
+    logger.info(f"Embedded {len(embeddings)} texts successfully")
+    return embeddings
 
 
 def embed_texts(texts: Sequence[str]) -> list[list[float]]:
     """
-    Embed multiple texts in a single batch API call.
+    Embed multiple texts in batch API calls.
+
+    Duplicate texts are sent once. Up to MAX_TEXTS_PER_REQUEST texts go out
+    in a single request; larger inputs are split into batches that are sent
+    concurrently.
 
     Args:
         texts: List of texts to embed
@@ -33,6 +133,14 @@ def embed_texts(texts: Sequence[str]) -> list[list[float]]:
     if not texts:
         return []
 
+    # Identical texts are embedded once
+    unique_texts = list(dict.fromkeys(texts))
+    if len(unique_texts) < len(texts):
+        return _expand_duplicates(texts, unique_texts, embed_texts(unique_texts))
+
+    if len(texts) > MAX_TEXTS_PER_REQUEST:
+        return run_async(embed_texts_async(texts))
+
     client = _get_client()
 
     logger.info(f"Embedding {len(texts)} texts with {EMBEDDING_MODEL}")
@@ -42,10 +150,7 @@ def embed_texts(texts: Sequence[str]) -> list[list[float]]:
         input=list(texts),
         dimensions=EMBEDDING_DIMENSIONS,
     )
-
-    # Sort by index to ensure order matches input
-    sorted_embeddings = sorted(response.data, key=lambda x: x.index)
-    embeddings = [item.embedding for item in sorted_embeddings]
+    embeddings = _sorted_embeddings(response)
 
     logger.info(f"Embedded {len(embeddings)} texts successfully")
     return embeddings
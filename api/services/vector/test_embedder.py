@@ -2,21 +2,20 @@
 
 Usage:
     cd api
-    python -m services.embed.test_embedder
+    python -m services.vector.test_embedder
 """
-import os
-import sys
+import numpy as np
 
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from dotenv import load_dotenv
-
-load_dotenv()
+def main():
+    # Imported here so collecting this file (e.g. by pytest) doesn't load
+    # .env or the OpenAI client
+    from dotenv import load_dotenv
 
-from services.embed import embed_texts, embed_text
+    load_dotenv()
 
+    from services.vector import embed_texts, embed_text
 
-def main():
     # Test single embedding
     print("Testing single text embedding...")
     text = "Insomnia is a significant problem among euthymic patients with bipolar disorder."
@@ -43,13 +42,6 @@ def main():
 
     # Test similarity (simple cosine)
     print("Testing similarity between embeddings...")
-    import math
-
-    def cosine_similarity(a: list[float], b: list[float]) -> float:
-        dot = sum(x * y for x, y in zip(a, b))
-        norm_a = math.sqrt(sum(x * x for x in a))
-        norm_b = math.sqrt(sum(x * x for x in b))
-        return dot / (norm_a * norm_b)
 
     # Embed two similar and one different claim
     claims = [
@@ -57,11 +49,15 @@ def main():
         "Insomnia frequently occurs in patients with bipolar disorder.",
         "Machine learning improves protein folding predictions.",
     ]
-    claim_embeddings = embed_texts(claims)
+    claim_embeddings = np.asarray(embed_texts(claims), dtype=np.float32)
+
+    # Normalize each row once; cosine similarity is then a single matmul
+    claim_embeddings /= np.linalg.norm(claim_embeddings, axis=1, keepdims=True)
+    similarity = claim_embeddings @ claim_embeddings.T
 
-    print(f"  Claim 0 vs 1 (similar): {cosine_similarity(claim_embeddings[0], claim_embeddings[1]):.4f}")
-    print(f"  Claim 0 vs 2 (different): {cosine_similarity(claim_embeddings[0], claim_embeddings[2]):.4f}")
-    print(f"  Claim 1 vs 2 (different): {cosine_similarity(claim_embeddings[1], claim_embeddings[2]):.4f}")
+    print(f"  Claim 0 vs 1 (similar): {similarity[0, 1]:.4f}")
+    print(f"  Claim 0 vs 2 (different): {similarity[0, 2]:.4f}")
+    print(f"  Claim 1 vs 2 (different): {similarity[1, 2]:.4f}")
 
     print()
     print("All tests passed!")
@@ -10,33 +10,51 @@ Options:
 
 import argparse
 import logging
+import os
+import select
 import signal
 import time
 import uuid
-from datetime import datetime
 from multiprocessing import Process
+from multiprocessing.connection import wait
 
 from models import JobStatus, JobType
 from services.jobs import JobQueue, JobHandlers
 
 
-def configure_logging():
+class WorkerIdFilter(logging.Filter):
+    """Give records that were logged without a `worker_id` extra this process's worker ID."""
+
+    def __init__(self, worker_id: str):
+        super().__init__()
+        self.worker_id = worker_id
+
+    def filter(self, record):
+        if not hasattr(record, "worker_id"):
+            record.worker_id = self.worker_id
+        return True
+
+
+def configure_logging(worker_id: str = "main"):
     """Configure logging for this process."""
     logging.basicConfig(
         level=logging.INFO,
-        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+        format="%(asctime)s [%(levelname)s] [%(worker_id)s] %(name)s: %(message)s",
         datefmt="%Y-%m-%d %H:%M:%S",
         force=True,  # Reconfigure for each subprocess
     )
+    # Service modules log through their own loggers; tag those records too
+    for handler in logging.getLogger().handlers:
+        handler.addFilter(WorkerIdFilter(worker_id))
     return logging.getLogger("worker")
 
 
 def run_worker(worker_num: int, poll_interval: float):
     """Run a single worker in its own process."""
-    logger = configure_logging()
     worker_id = f"worker-{worker_num}-{uuid.uuid4().hex[:6]}"
+    logger = logging.LoggerAdapter(configure_logging(worker_id), {"worker_id": worker_id})
 
-    logger.info(f"[{worker_id}] Starting job loop")
+    logger.info("Starting job loop")
 
     queue = JobQueue()
     handlers = JobHandlers()
@@ -44,12 +62,29 @@ def run_worker(worker_num: int, poll_interval: float):
 
     def handle_signal(sig, frame):
         nonlocal running
-        logger.info(f"[{worker_id}] Received signal {sig}, stopping...")
+        logger.info("Received signal %s, stopping...", sig)
         running = False
 
     signal.signal(signal.SIGINT, handle_signal)
     signal.signal(signal.SIGTERM, handle_signal)
 
+    # Signals also write a byte to this pipe, so idle waits end as soon as one arrives
+    wakeup_r, wakeup_w = os.pipe()
+    os.set_blocking(wakeup_r, False)
+    os.set_blocking(wakeup_w, False)
+    signal.set_wakeup_fd(wakeup_w)
+
+    def idle_wait():
+        """Wait up to poll_interval, returning early if a signal arrives."""
+        if running:
+            select.select([wakeup_r], [], [], poll_interval)
+        # Drain the pipe so the next wait blocks again
+        try:
+            while os.read(wakeup_r, 512):
+                pass
+        except BlockingIOError:
+            pass
+
     while running:
         try:
             job = queue.claim_job(worker_id)
@@ -57,18 +92,19 @@ def run_worker(worker_num: int, poll_interval: float):
             if job:
                 process_job(worker_id, job, queue, handlers, logger)
             else:
-                time.sleep(poll_interval)
+                idle_wait()
 
         except Exception as e:
-            logger.error(f"[{worker_id}] Error in worker loop: {e}")
-            time.sleep(poll_interval)
+            logger.error("Error in worker loop: %s", e)
+            idle_wait()
 
-    logger.info(f"[{worker_id}] Stopped")
+    logger.info("Stopped")
 
 
 def process_job(worker_id: str, job: dict, queue: JobQueue, handlers: JobHandlers, logger):
     """Process a single job."""
     job_id = job["id"]
+    short_id = job_id[:8]
     job_type = job["job_type"]
     payload = job.get("payload") or {}
     payload["job_id"] = job_id
@@ -76,11 +112,11 @@ def process_job(worker_id: str, job: dict, queue: JobQueue, handlers: JobHandler
     max_attempts = job["max_attempts"]
 
     logger.info(
-        f"[{worker_id}] Processing job {job_id[:8]}... "
-        f"(type={job_type}, attempt {attempt}/{max_attempts})"
+        "Processing job %s... (type=%s, attempt %d/%d)",
+        short_id, job_type, attempt, max_attempts,
     )
 
-    start_time = datetime.now()
+    start_time = time.perf_counter()
 
     try:
         result = handlers.process(JobType(job_type), payload)
@@ -92,8 +128,8 @@ def process_job(worker_id: str, job: dict, queue: JobQueue, handlers: JobHandler
             result=result,
         )
 
-        duration = (datetime.now() - start_time).total_seconds()
-        logger.info(f"[{worker_id}] Completed job {job_id[:8]}... in {duration:.2f}s")
+        duration = time.perf_counter() - start_time
+        logger.info("Completed job %s... in %.2fs", short_id, duration)
 
     except Exception as e:
         queue.complete_job(
@@ -103,8 +139,8 @@ def process_job(worker_id: str, job: dict, queue: JobQueue, handlers: JobHandler
             error=str(e),
         )
 
-        duration = (datetime.now() - start_time).total_seconds()
-        logger.error(f"[{worker_id}] Failed job {job_id[:8]}... after {duration:.2f}s: {e}")
+        duration = time.perf_counter() - start_time
+        logger.error("Failed job %s... after %.2fs: %s", short_id, duration, e)
 
 
 def main():
@@ -153,19 +189,21 @@ def main():
 
     # Monitor and restart crashed workers
     while not shutdown_requested:
-        time.sleep(2)  # Check every 2 seconds
-
-        for worker_num, proc in list(processes.items()):
-            if not proc.is_alive():
-                exit_code = proc.exitcode
-                if exit_code != 0 and not shutdown_requested:
-                    logger.warning(
-                        f"Worker-{worker_num} (pid={proc.pid}) died with exit code {exit_code}, restarting..."
-                    )
-                    processes[worker_num] = start_worker(worker_num)
-                elif not shutdown_requested:
-                    logger.info(f"Worker-{worker_num} exited cleanly, restarting...")
-                    processes[worker_num] = start_worker(worker_num)
+        # Block until a worker exits; time out every 2 seconds to check for shutdown
+        workers_by_sentinel = {proc.sentinel: worker_num for worker_num, proc in processes.items()}
+        for sentinel in wait(list(workers_by_sentinel), timeout=2):
+            worker_num = workers_by_sentinel[sentinel]
+            proc = processes[worker_num]
+            proc.join()  # Already exited; reaps it and sets exitcode
+            exit_code = proc.exitcode
+            if exit_code != 0 and not shutdown_requested:
+                logger.warning(
+                    f"Worker-{worker_num} (pid={proc.pid}) died with exit code {exit_code}, restarting..."
+                )
+                processes[worker_num] = start_worker(worker_num)
+            elif not shutdown_requested:
+                logger.info(f"Worker-{worker_num} exited cleanly, restarting...")
+                processes[worker_num] = start_worker(worker_num)
 
     # Shutdown: terminate all workers
     logger.info("Stopping all workers...")